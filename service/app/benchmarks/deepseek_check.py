@@ -0,0 +1,208 @@
+"""
+Resilience check of DeepSeekClient against the fake DeepSeek server.
+
+Runs the scenarios below in order and exits with status 1 if any of them fails.
+No DB, app or real DeepSeek key is needed.
+
+    retry          503s below the retry limit are retried and the call succeeds
+    client_error   a 400 is not retried and does not count against the breaker
+    breaker_open   failed calls open the circuit, which then fails fast without requests
+    half_open      after the reset time one trial call closes the circuit again
+    trial_release  a cancelled or undecodable half-open trial frees the trial slot
+    pool_timeout   a saturated local connection pool is neither retried nor counted against the breaker
+    stream         the streaming call retries before the first delta and closes the circuit
+
+    python -m benchmarks.deepseek_check
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from benchmarks.fake_deepseek import FakeDeepSeekServer, start_fake_deepseek
+import httpx
+
+from core.errors import ServiceError, TooManyRequestsError, UpstreamUnavailableError
+from services.deepseek_client import CircuitBreaker, DeepSeekClient
+
+FAILURE_THRESHOLD = 2
+RESET_SECONDS = 0.2
+BODY = {"model": "deepseek-chat", "messages": [{"role": "user", "content": "spelling=apple"}]}
+
+class CheckFailed(Exception):
+    pass
+
+def expect(cond: bool, message: str) -> None:
+    if not cond:
+        raise CheckFailed(message)
+
+def make_client(server: FakeDeepSeekServer, max_retries: int, max_connections: int = 4) -> DeepSeekClient:
+    client = DeepSeekClient(
+        url=f"http://127.0.0.1:{server.server_address[1]}/chat/completions",
+        api_key="fake",
+        timeout=5.0,
+        max_retries=max_retries,
+        backoff_base=0.01,
+        backoff_max=0.02,
+        max_connections=max_connections,
+    )
+    client.breaker = CircuitBreaker(failure_threshold=FAILURE_THRESHOLD, reset_seconds=RESET_SECONDS)
+    return client
+
+async def expect_raises(coro: Awaitable, exc_type: type, message: str) -> None:
+    try:
+        await coro
+    except exc_type:
+        return
+    except Exception as e:
+        raise CheckFailed(f"{message}, got {e!r}")
+    raise CheckFailed(message)
+
+async def open_circuit(server: FakeDeepSeekServer, client: DeepSeekClient) -> None:
+    server.fail_next(FAILURE_THRESHOLD * (client.max_retries + 1))
+    for _ in range(FAILURE_THRESHOLD):
+        await expect_raises(client.post_chat(BODY), UpstreamUnavailableError, "exhausted retries should raise UpstreamUnavailableError")
+    expect(client.breaker.state == "open", f"circuit should be open, got {client.breaker.state}")
+
+async def check_retry(server: FakeDeepSeekServer) -> None:
+    client = make_client(server, max_retries=3)
+    try:
+        server.fail_next(2)
+        before = server.requests
+        resp = await client.post_chat(BODY)
+        expect("choices" in resp, "successful call should return the completion body")
+        expect(server.requests - before == 3, f"expected 3 requests, got {server.requests - before}")
+        expect(client.retries == 2, f"expected 2 retries, got {client.retries}")
+        expect(client.breaker.state == "closed", f"circuit should stay closed, got {client.breaker.state}")
+    finally:
+        await client.aclose()
+
+async def check_client_error(server: FakeDeepSeekServer) -> None:
+    client = make_client(server, max_retries=3)
+    try:
+        server.fail_next(FAILURE_THRESHOLD + 1, status=400)
+        for _ in range(FAILURE_THRESHOLD + 1):
+            await expect_raises(client.post_chat(BODY), ServiceError, "a 400 should raise ServiceError")
+        expect(client.retries == 0, f"a 400 should not be retried, got {client.retries} retries")
+        expect(client.breaker.state == "closed", f"client errors should not open the circuit, got {client.breaker.state}")
+    finally:
+        await client.aclose()
+
+async def check_breaker_open(server: FakeDeepSeekServer) -> None:
+    client = make_client(server, max_retries=1)
+    try:
+        await open_circuit(server, client)
+        before = server.requests
+        await expect_raises(client.post_chat(BODY), UpstreamUnavailableError, "an open circuit should fail fast")
+        expect(server.requests == before, "an open circuit should not send requests")
+        expect(client.short_circuited == 1, f"expected 1 short-circuited call, got {client.short_circuited}")
+    finally:
+        await client.aclose()
+
+async def check_half_open(server: FakeDeepSeekServer) -> None:
+    client = make_client(server, max_retries=1)
+    try:
+        await open_circuit(server, client)
+
+        # a failed trial re-opens the circuit at once
+        await asyncio.sleep(RESET_SECONDS)
+        expect(client.breaker.state == "half-open", f"circuit should be half-open, got {client.breaker.state}")
+        server.fail_next(client.max_retries + 1)
+        await expect_raises(client.post_chat(BODY), UpstreamUnavailableError, "a failed trial should raise")
+        expect(client.breaker.state == "open", f"a failed trial should re-open the circuit, got {client.breaker.state}")
+
+        # a successful trial closes it
+        await asyncio.sleep(RESET_SECONDS)
+        await client.post_chat(BODY)
+        expect(client.breaker.state == "closed", f"a successful trial should close the circuit, got {client.breaker.state}")
+    finally:
+        await client.aclose()
+
+async def check_trial_release(server: FakeDeepSeekServer) -> None:
+    client = make_client(server, max_retries=0)
+    try:
+        await open_circuit(server, client)
+        await asyncio.sleep(RESET_SECONDS)
+
+        # the caller goes away while the trial is in flight
+        server.fail_next(1, delay=0.5)
+        task = asyncio.create_task(client.post_chat(BODY))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        expect(client.breaker.allow(), "a cancelled trial should free the trial slot")
+        client.breaker.release()
+        server.clear_failures()
+
+        # a 200 whose body is not JSON
+        server.fail_next(1, status=200, body="not json")
+        await expect_raises(client.post_chat(BODY), ValueError, "an undecodable body should raise")
+        expect(client.breaker.allow(), "an undecodable trial should free the trial slot")
+        client.breaker.release()
+
+        await client.post_chat(BODY)
+        expect(client.breaker.state == "closed", f"circuit should close after a good trial, got {client.breaker.state}")
+    finally:
+        await client.aclose()
+
+async def check_pool_timeout(server: FakeDeepSeekServer) -> None:
+    client = make_client(server, max_retries=2, max_connections=1)
+    client._client.timeout = httpx.Timeout(5.0, pool=0.1)
+    try:
+        # the only connection is held by a slow call
+        server.fail_next(1, status=200, body='{"choices": []}', delay=0.5)
+        slow = asyncio.create_task(client.post_chat(BODY))
+        await asyncio.sleep(0.05)
+        for _ in range(FAILURE_THRESHOLD + 1):
+            await expect_raises(client.post_chat(BODY), TooManyRequestsError, "a pool timeout should raise TooManyRequestsError")
+        await slow
+        expect(client.retries == 0, f"a pool timeout should not be retried, got {client.retries} retries")
+        expect(client.pool_exhausted == FAILURE_THRESHOLD + 1, f"expected {FAILURE_THRESHOLD + 1} pool timeouts, got {client.pool_exhausted}")
+        expect(client.breaker.state == "closed", f"pool timeouts should not open the circuit, got {client.breaker.state}")
+    finally:
+        await client.aclose()
+
+async def check_stream(server: FakeDeepSeekServer) -> None:
+    client = make_client(server, max_retries=2)
+    try:
+        server.fail_next(2)
+        deltas = [d async for d in client.stream_chat(BODY)]
+        expect("apple" in "".join(deltas), "stream should yield the entry text")
+        expect(client.retries == 2, f"expected 2 retries, got {client.retries}")
+        expect(client.breaker.state == "closed", f"circuit should stay closed, got {client.breaker.state}")
+    finally:
+        await client.aclose()
+
+SCENARIOS: List[Tuple[str, Callable[[FakeDeepSeekServer], Awaitable[None]]]] = [
+    ("retry", check_retry),
+    ("client_error", check_client_error),
+    ("breaker_open", check_breaker_open),
+    ("half_open", check_half_open),
+    ("trial_release", check_trial_release),
+    ("pool_timeout", check_pool_timeout),
+    ("stream", check_stream),
+]
+
+async def _main(args: argparse.Namespace) -> int:
+    server = start_fake_deepseek(args.host, 0)
+    failed = 0
+    try:
+        for name, check in SCENARIOS:
+            server.clear_failures()
+            start = time.perf_counter()
+            try:
+                await check(server)
+                result = "ok"
+            except CheckFailed as e:
+                failed += 1
+                result = f"FAILED: {e}"
+            print(f"{name:<15}{(time.perf_counter() - start) * 1000:>8.0f} ms  {result}")
+    finally:
+        server.shutdown()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check DeepSeekClient retries and circuit breaker against a fake server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
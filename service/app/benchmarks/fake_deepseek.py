@@ -0,0 +1,122 @@
+"""
+Fake DeepSeek chat completions server for benchmarks.
+
+Echoes the spelling found in the prompt as a labeled entry, with an optional
+artificial latency, in both the plain JSON and the streaming (SSE) format.
+`FakeDeepSeekServer.fail_next` makes the next requests answer with an error
+status (or a broken body) instead, for exercising retries and the circuit breaker.
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SPELLING_RX = re.compile(r"spelling=(\S+)")
+
+def make_entry_text(prompt: str) -> str:
+    m = SPELLING_RX.search(prompt)
+    spelling = m.group(1) if m else "word"
+    return (
+        f"スペル: {spelling}\n"
+        f"意味: {spelling}の意味\n"
+        f"英文: This is an example of {spelling}.\n"
+        f"和訳: これは{spelling}の例文です。"
+    )
+
+class FakeDeepSeekHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency_seconds = 0.0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        text = make_entry_text(body["messages"][-1]["content"])
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+        failure = self.server.take_failure()
+        if failure is not None:
+            status, data, delay = failure
+            time.sleep(delay)
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        if not body.get("stream"):
+            data = json.dumps({"choices": [{"message": {"content": text}}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i in range(0, len(text), 8):
+            event = "data: " + json.dumps({"choices": [{"delta": {"content": text[i:i + 8]}}]}) + "\n\n"
+            self._write_chunk(event.encode())
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeDeepSeekServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, handler):
+        super().__init__(server_address, handler)
+        self.requests = 0
+        self._failures: deque = deque()
+        self._lock = threading.Lock()
+
+    def fail_next(self, count: int, status: int = 503, body: str = "injected failure", delay: float = 0.0) -> None:
+        """Answer the next `count` requests with `status` and a plain-text `body`, after `delay` seconds."""
+        with self._lock:
+            self._failures.extend([(status, body.encode(), delay)] * count)
+
+    def clear_failures(self) -> None:
+        with self._lock:
+            self._failures.clear()
+
+    def handle_error(self, request, client_address):
+        # clients that give up mid-request (cancelled calls) are expected here
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def take_failure(self) -> tuple[int, bytes, float] | None:
+        with self._lock:
+            self.requests += 1
+            return self._failures.popleft() if self._failures else None
+
+def start_fake_deepseek(host: str = "127.0.0.1", port: int = 0, latency_seconds: float = 0.0) -> FakeDeepSeekServer:
+    """Start the server on a daemon thread; the bound port is server.server_address[1]."""
+    handler = type("Handler", (FakeDeepSeekHandler,), {"latency_seconds": latency_seconds})
+    server = FakeDeepSeekServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake DeepSeek chat completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="artificial latency per request in seconds")
+    args = parser.parse_args()
+    server = start_fake_deepseek(args.host, args.port, args.latency)
+    print(f"fake DeepSeek listening on http://{args.host}:{server.server_address[1]}/")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,82 @@
+"""
+Per-item cost of turning DB documents into a JSON response body.
+
+    before  return the response model and let FastAPI handle it (fastapi.routing.serialize_response + JSONResponse):
+            the model is dumped, validated again against response_model, serialized and json.dumps'ed
+    after   return ModelJSONResponse: the model is serialized once by pydantic-core
+
+Both paths include building the response from documents the way WordService does.
+
+    python -m benchmarks.serialization_bench --items 1000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, List
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import BaseModel
+
+from benchmarks.synthetic import make_spellings
+from core.responses import ModelJSONResponse
+from models.word import WordModel
+from schemas.word_schemas import GetWordListResponse, GetWordListResponseBase, SuggestWordsResponse, SuggestWordsResponseBase
+
+def make_word_docs(n: int) -> List[dict]:
+    return [
+        {"_id": ObjectId(), "details": {"spelling": s, "meaning": f"{s}の意味"}, "registration_count": i % 7}
+        for i, s in enumerate(make_spellings(n))
+    ]
+
+def make_word_list_docs(n: int) -> List[dict]:
+    # shape of UserWordRepository.iter_word_list items
+    return [{"user_word_id": str(ObjectId()), "spelling": s, "meaning": f"{s}の意味"} for s in make_spellings(n)]
+
+def build_word_list(docs: List[dict]) -> GetWordListResponse:
+    items = [GetWordListResponseBase(user_word_id=d["user_word_id"], spelling=d["spelling"], meaning=d.get("meaning")) for d in docs]
+    return GetWordListResponse(word_list=items, next_cursor=None)
+
+def build_suggest(docs: List[dict]) -> SuggestWordsResponse:
+    words = [WordModel.model_validate(d) for d in docs]
+    items = [SuggestWordsResponseBase(word_id=str(w.id), spelling=w.details.spelling, meaning=w.details.meaning) for w in words]
+    return SuggestWordsResponse(word_list=items)
+
+async def measure_before(build: Callable[[List[dict]], BaseModel], response_model: type, docs: List[dict], repeat: int) -> float:
+    field = create_model_field(name="Response", type_=response_model, mode="serialization")
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        content = await serialize_response(field=field, response_content=build(docs))
+        JSONResponse(content)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) / len(docs)
+
+async def measure_after(build: Callable[[List[dict]], BaseModel], docs: List[dict], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ModelJSONResponse(build(docs))
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) / len(docs)
+
+async def _main(n_items: int, repeat: int) -> None:
+    cases = [
+        ("get_user_word_list", GetWordListResponse, make_word_list_docs(n_items), build_word_list),
+        ("suggest_words", SuggestWordsResponse, make_word_docs(n_items), build_suggest),
+    ]
+    print(f"{'endpoint':<22}{'before us/item':>16}{'after us/item':>16}{'speedup':>10}")
+    for name, model, docs, build in cases:
+        b = await measure_before(build, model, docs, repeat) * 1e6
+        a = await measure_after(build, docs, repeat) * 1e6
+        print(f"{name:<22}{b:>16.2f}{a:>16.2f}{b / a:>9.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-item response serialization cost.")
+    parser.add_argument("--items", type=int, default=1000, help="items per response")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(_main(args.items, args.repeat))
@@ -0,0 +1,165 @@
+"""
+Micro-benchmark of the word suggestion pipeline at dictionary scale.
+
+Builds synthetic dictionaries, runs query sets (short prefixes, typos, long words)
+through each stage of `WordService.generate_word_suggestion` in isolation and
+reports time and allocations per stage. No DB or app is needed.
+
+Stages:
+    index_build    SuggestIndex.load (once per dictionary)
+    index_top      SuggestIndex.top: the whole suggestion when the index is loaded
+    collect_regex  the subsequence regex of the DB fallback, scanned in-process (truncated at the candidate limit)
+    score          LcsScorer.score_all over the collect_regex candidates
+    rank           heapq.nsmallest(max_num, ..., key=suggestion_rank_key) over the scored candidates
+
+"matches" is the mean number of words matching a query (the work a full scan would score).
+
+    python -m benchmarks.suggest_bench --sizes 1000,10000,100000,1000000 --out suggest.json
+"""
+import argparse
+import asyncio
+import heapq
+import json
+import random
+import re
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from bson import ObjectId
+
+from benchmarks.synthetic import make_spellings, make_typo
+from core.const import MAX_NUM_WORD_SUGGEST, MAX_NUM_WORD_SUGGEST_CANDIDATE
+from models.word import WordRecord
+from services.lcs_scorer import LcsScorer
+from services.suggest_index import SuggestIndex, _is_subsequence, suggestion_rank_key
+
+QUERY_KINDS = ("prefix", "typo", "long")
+STAGES = ("index_top", "collect_regex", "score", "rank")
+
+def make_words(spellings: List[str], rng: random.Random) -> List[WordRecord]:
+    # registration counts are heavily skewed in practice
+    return [WordRecord(ObjectId(), s, None, int(rng.paretovariate(1.5)) - 1) for s in spellings]
+
+def make_queries(spellings: List[str], n: int, rng: random.Random) -> Dict[str, List[str]]:
+    long_words = [s for s in spellings if len(s) >= 10] or spellings
+    return {
+        "prefix": [s[: rng.randint(1, 3)] for s in rng.choices(spellings, k=n)],
+        "typo": [make_typo(rng, s) for s in rng.choices(spellings, k=n)],
+        "long": rng.choices(long_words, k=n),
+    }
+
+def make_stages(index: SuggestIndex, words: List[WordRecord], max_num: int) -> Dict[str, Callable[[str, list], list]]:
+    """Each stage takes (query, output of the previous stage) and returns its own output."""
+
+    def index_top(q: str, _prev: list) -> list:
+        return index.top(q, max_num)
+
+    def collect_regex(q: str, _prev: list) -> list:
+        rx = re.compile(".*".join(re.escape(ch) for ch in q), re.IGNORECASE)
+        out = []
+        for w in words:
+            if rx.search(w.spelling):
+                out.append(w)
+                if len(out) >= MAX_NUM_WORD_SUGGEST_CANDIDATE:
+                    break
+        return out
+
+    def score(q: str, candidates: list) -> list:
+        scores = LcsScorer(q.lower()).score_all(m.spelling.lower() for m in candidates)
+        return list(zip(scores, candidates))
+
+    def rank(q: str, scored: list) -> list:
+        return heapq.nsmallest(max_num, scored, key=suggestion_rank_key)
+
+    return {"index_top": index_top, "collect_regex": collect_regex, "score": score, "rank": rank}
+
+def run_stage(fn: Callable[[str, list], list], queries: List[str], inputs: List[list], trace: bool) -> dict:
+    times: List[float] = []
+    peaks: List[int] = []
+    for q, c in zip(queries, inputs):
+        if trace:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn(q, c)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        else:
+            start = time.perf_counter()
+            fn(q, c)
+            times.append(time.perf_counter() - start)
+
+    if trace:
+        return {"peak_alloc_kib_mean": statistics.fmean(peaks) / 1024, "peak_alloc_kib_max": max(peaks) / 1024}
+    times.sort()
+    return {
+        "mean_us": statistics.fmean(times) * 1e6,
+        "p50_us": times[len(times) // 2] * 1e6,
+        "p95_us": times[min(len(times) - 1, int(len(times) * 0.95))] * 1e6,
+    }
+
+def bench_size(size: int, n_queries: int, max_num: int, seed: int, trace: bool) -> dict:
+    rng = random.Random(seed)
+    spellings = make_spellings(size, seed=seed)
+    words = make_words(spellings, rng)
+
+    async def _records():
+        for w in words:
+            yield w
+
+    index = SuggestIndex()
+    start = time.perf_counter()
+    asyncio.run(index.load(_records()))
+    result: dict = {"index_build_seconds": time.perf_counter() - start, "queries": {}}
+
+    stages = make_stages(index, words, max_num)
+    for kind, queries in make_queries(spellings, n_queries, rng).items():
+        matches = [sum(1 for s in spellings if _is_subsequence(q.lower(), s)) for q in queries]
+        candidates = [stages["collect_regex"](q, []) for q in queries]
+        inputs = {
+            "index_top": [[]] * len(queries),
+            "collect_regex": [[]] * len(queries),
+            "score": candidates,
+            "rank": [stages["score"](q, c) for q, c in zip(queries, candidates)],
+        }
+        per_stage = {name: run_stage(stages[name], queries, inputs[name], trace=False) for name in STAGES}
+        if trace:
+            tracemalloc.start()
+            try:
+                for name in STAGES:
+                    per_stage[name].update(run_stage(stages[name], queries, inputs[name], trace=True))
+            finally:
+                tracemalloc.stop()
+        result["queries"][kind] = {
+            "matches_mean": statistics.fmean(matches),
+            "stages": per_stage,
+        }
+    return result
+
+def print_result(size: int, result: dict) -> None:
+    print(f"\n== {size} words (index build {result['index_build_seconds']:.2f}s)")
+    print(f"{'query':<8}{'stage':<15}{'matches':>9}{'mean us':>12}{'p95 us':>12}{'peak KiB':>11}")
+    for kind, q in result["queries"].items():
+        for name, s in q["stages"].items():
+            peak = s.get("peak_alloc_kib_mean")
+            peak_str = f"{peak:>11.1f}" if peak is not None else f"{'-':>11}"
+            print(f"{kind:<8}{name:<15}{q['matches_mean']:>9.0f}{s['mean_us']:>12.1f}{s['p95_us']:>12.1f}{peak_str}")
+
+def _main(args: argparse.Namespace) -> None:
+    results = {}
+    for size in (int(s) for s in args.sizes.split(",")):
+        results[str(size)] = bench_size(size, args.queries, args.max_num, args.seed, trace=not args.no_tracemalloc)
+        print_result(size, results[str(size)])
+    if args.out:
+        Path(args.out).write_text(json.dumps({"config": vars(args), "results": results}, indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmark of the word suggestion pipeline.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated dictionary sizes")
+    parser.add_argument("--queries", type=int, default=200, help="queries per kind")
+    parser.add_argument("--max-num", type=int, default=MAX_NUM_WORD_SUGGEST)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip the allocation pass")
+    parser.add_argument("--out", help="write the result JSON here")
+    _main(parser.parse_args())
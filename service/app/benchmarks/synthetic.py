@@ -0,0 +1,47 @@
+import random
+from typing import List
+
+# rough length distribution of English dictionary words (length -> weight)
+WORD_LENGTH_WEIGHTS = {
+    2: 1, 3: 4, 4: 8, 5: 11, 6: 13, 7: 14, 8: 13, 9: 11,
+    10: 8, 11: 6, 12: 4, 13: 3, 14: 2, 15: 1, 16: 1,
+}
+
+# English letter frequency in percent
+LETTER_WEIGHTS = {
+    "e": 12.7, "t": 9.1, "a": 8.2, "o": 7.5, "i": 7.0, "n": 6.7, "s": 6.3, "h": 6.1,
+    "r": 6.0, "d": 4.3, "l": 4.0, "c": 2.8, "u": 2.8, "m": 2.4, "w": 2.4, "f": 2.2,
+    "g": 2.0, "y": 2.0, "p": 1.9, "b": 1.5, "v": 1.0, "k": 0.8, "j": 0.2, "x": 0.2,
+    "q": 0.1, "z": 0.1,
+}
+
+def make_spellings(n: int, seed: int = 0) -> List[str]:
+    """Return n distinct synthetic spellings, deterministic for a given seed."""
+    rng = random.Random(seed)
+    letters = list(LETTER_WEIGHTS)
+    letter_weights = list(LETTER_WEIGHTS.values())
+    lengths = list(WORD_LENGTH_WEIGHTS)
+    length_weights = list(WORD_LENGTH_WEIGHTS.values())
+
+    seen: set[str] = set()
+    spellings: List[str] = []
+    while len(spellings) < n:
+        # draw in chunks, choices() per call is the slow part
+        for length in rng.choices(lengths, weights=length_weights, k=min(n - len(spellings), 10000)):
+            s = "".join(rng.choices(letters, weights=letter_weights, k=length))
+            if s not in seen:
+                seen.add(s)
+                spellings.append(s)
+    return spellings
+
+def make_typo(rng: random.Random, spelling: str) -> str:
+    """Apply one random substitution / deletion / transposition."""
+    if len(spelling) < 3:
+        return spelling
+    i = rng.randrange(len(spelling) - 1)
+    op = rng.randrange(3)
+    if op == 0:
+        return spelling[:i] + rng.choice(list(LETTER_WEIGHTS)) + spelling[i + 1:]
+    if op == 1:
+        return spelling[:i] + spelling[i + 1:]
+    return spelling[:i] + spelling[i + 1] + spelling[i] + spelling[i + 2:]
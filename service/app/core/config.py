@@ -8,6 +8,8 @@ DB_NAME = os.getenv("DB_NAME", "")
 USER_COLLECTION_NAME = os.getenv("USER_COLLECTION_NAME", "")
 WORD_COLLECTION_NAME = os.getenv("WORD_COLLECTION_NAME", "")
 USER_WORD_COLLECTION_NAME=os.getenv("USER_WORD_COLLECTION_NAME", "")
+AI_ENTRY_CACHE_COLLECTION_NAME = os.getenv("AI_ENTRY_CACHE_COLLECTION_NAME", "ai_entry_cache")
+POPULAR_WORDS_COLLECTION_NAME = os.getenv("POPULAR_WORDS_COLLECTION_NAME", "popular_words")
 
 #jwt
 JWT_KEY = os.getenv("JWT_KEY")
@@ -1,9 +1,50 @@
 # cookie settings
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+VERIFIED_TOKEN_CACHE_SIZE = 10000
+
+# password hashing pool
+PW_HASH_POOL_MAX_WORKERS = 2
+PW_HASH_POOL_MAX_PENDING = 32
+
+# user word list
+USER_WORD_LIST_MAX_LIMIT = 1000
+WORD_EXPORT_CHUNK_BYTES = 64 * 1024
+WORD_LIST_CACHE_SIZE = 1000
+
+# DeepSeek API client
+DEEPSEEK_TIMEOUT_SECONDS = 30
+DEEPSEEK_MAX_RETRIES = 2
+DEEPSEEK_BACKOFF_BASE_SECONDS = 0.5
+DEEPSEEK_BACKOFF_MAX_SECONDS = 8
+DEEPSEEK_MAX_CONNECTIONS = 20
+DEEPSEEK_CIRCUIT_FAILURE_THRESHOLD = 5
+DEEPSEEK_CIRCUIT_RESET_SECONDS = 30
+
+# batch generation
+MAX_NUM_BATCH_GENERATE = 50
+BATCH_GENERATE_CONCURRENCY = 5
+
+# AI generated entry cache
+AI_ENTRY_CACHE_LRU_SIZE = 1000
+AI_ENTRY_CACHE_TTL_SECONDS = 60 * 60 * 24 * 30
+
+# bulk register / delete
+MAX_NUM_BULK_WORD_OPERATION = 500
+# a bulk delete's claim on its links (without a transaction) can be taken over after this
+USER_WORD_DELETE_CLAIM_SECONDS = 60
+
+# dictionary import
+DICTIONARY_IMPORT_BATCH_SIZE = 1000
+DICTIONARY_IMPORT_CONCURRENCY = 4
+
+# popular words
+POPULAR_WORDS_SIZE = 100
+POPULAR_WORDS_REFRESH_SECONDS = 300
 
 # word suggest 
 MAX_NUM_WORD_SUGGEST = 10
 MAX_NUM_WORD_SUGGEST_CANDIDATE = 100
+SUGGEST_CACHE_SIZE = 2000
 
 # validation 
 USERNAME_MIN_LEN = 3 
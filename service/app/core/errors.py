@@ -13,6 +13,9 @@ class InvalidTokenError(UnauthorizedError):
 class ServiceError(AppError):
     """Raised when unexpected failure in repositories or external services. This is caused by the server (not client)."""
 
+class UpstreamUnavailableError(ServiceError):
+    """Raised when an external service (e.g. DeepSeek API) is unavailable or degraded."""
+
 class BadRequestError(AppError): 
     """Client sent invalid input or violated business rules."""
 
@@ -25,6 +28,9 @@ class InvalidCredentialsError(AppError):
 class AuthenticationBackendError(AppError): 
     """Raised when underlying auth datastore / hashing / jwt fails."""
 
+class TooManyRequestsError(AppError):
+    """Raised when a bounded resource (e.g. password hashing pool) is saturated."""
+
 class NotFoundError(AppError): 
     """Raised when an item which should be in the db is not in the db."""
 
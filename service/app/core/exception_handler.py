@@ -6,7 +6,8 @@ from pymongo import errors as mongo_errors
 from core.errors import (
     UnauthorizedError, TokenExpiredError, InvalidTokenError,
     BadRequestError, ConflictError, ServiceError, 
-    InvalidCredentialsError, AuthenticationBackendError
+    InvalidCredentialsError, AuthenticationBackendError, TooManyRequestsError,
+    UpstreamUnavailableError,
 )
 
 def register_exception_handlers(app):
@@ -48,6 +49,13 @@ def register_exception_handlers(app):
             content={"error": {"type": "ServiceError", "detail": str(exc) or "Internal server error"}},
         )
 
+    @app.exception_handler(UpstreamUnavailableError)
+    async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailableError):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"error": {"type": "UpstreamUnavailable", "detail": str(exc) or "Upstream service unavailable"}},
+        )
+
     @app.exception_handler(InvalidCredentialsError)
     async def invalid_credentials_handler(request: Request, exc: InvalidCredentialsError):
         return JSONResponse(
@@ -62,6 +70,14 @@ def register_exception_handlers(app):
             content={"error": {"type": "Authentication backend failure", "detail": str(exc) or "Authentication backend failure"}},
         )
 
+    @app.exception_handler(TooManyRequestsError)
+    async def too_many_requests_handler(request: Request, exc: TooManyRequestsError):
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"error": {"type": "TooManyRequests", "detail": str(exc) or "Too many requests"}},
+            headers={"Retry-After": "1"},
+        )
+
     # ---------- Framework-level ----------
     @app.exception_handler(RequestValidationError)
     async def validation_handler(request: Request, exc: RequestValidationError):
@@ -0,0 +1,62 @@
+import time
+from typing import Dict, Tuple
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, MONGO_COMMAND_DURATION, MONGO_COMMAND_FAILURES
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and status code per operation_id."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # the router stores the matched route in scope
+            route = scope.get("route")
+            operation_id = getattr(route, "operation_id", None) or getattr(route, "name", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, operation_id, method)
+            HTTP_REQUESTS.inc(operation_id, method, str(status_code))
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """pymongo command listener recording duration per collection / command."""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[int, int], str] = {}
+
+    @staticmethod
+    def _collection(event: monitoring.CommandStartedEvent) -> str:
+        target = event.command.get(event.command_name)
+        if isinstance(target, str):
+            return target
+        # e.g. getMore carries the cursor id here and the collection separately
+        collection = event.command.get("collection")
+        return collection if isinstance(collection, str) else "-"
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self._pending[(event.request_id, event.operation_id)] = self._collection(event)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        collection = self._pending.pop((event.request_id, event.operation_id), "-")
+        MONGO_COMMAND_DURATION.observe(event.duration_micros / 1e6, collection, event.command_name)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._pending.pop((event.request_id, event.operation_id), "-")
+        MONGO_COMMAND_DURATION.observe(event.duration_micros / 1e6, collection, event.command_name)
+        MONGO_COMMAND_FAILURES.inc(collection, event.command_name)
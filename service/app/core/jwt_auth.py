@@ -1,10 +1,13 @@
 import jwt
+from functools import lru_cache
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
 import core.config as config
 import core.const as const
 from core.errors import TokenExpiredError, InvalidTokenError
 from core.oid import PyObjectId
+from core.pw_hash_pool import pw_hash_pool
+from core.token_cache import VerifiedTokenCache
 
 JWT_KEY = config.JWT_KEY  
 ACCESS_TOKEN_EXPIRE_MINUTES = const.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -26,18 +29,19 @@ class AuthJwtCsrt:
         )
         self.secret_key = (secret_key or JWT_KEY or "").strip()
         self.algorithm = algorithm
+        self.token_cache = VerifiedTokenCache()
 
         if not self.secret_key:
             raise RuntimeError("JWT secret key is missing. Set JWT_KEY in your config/env.")
 
     # --- Password helpers ---
-    def generate_hashed_pw(self, password: str) -> str:
-        """Return bcrypt-hashed password."""
-        return self.pwd_ctx.hash(password)
+    async def generate_hashed_pw(self, password: str) -> str:
+        """Return bcrypt-hashed password (computed on the password hashing pool)."""
+        return await pw_hash_pool.run(self.pwd_ctx.hash, password)
 
-    def verify_pw(self, plain_pw: str, hashed_pw: str) -> bool:
-        """Return True if plain password matches the hashed one."""
-        return self.pwd_ctx.verify(plain_pw, hashed_pw)
+    async def verify_pw(self, plain_pw: str, hashed_pw: str) -> bool:
+        """Return True if plain password matches the hashed one (computed on the password hashing pool)."""
+        return await pw_hash_pool.run(self.pwd_ctx.verify, plain_pw, hashed_pw)
 
     # --- JWT helpers ---
     def encode_jwt(
@@ -69,7 +73,12 @@ class AuthJwtCsrt:
     ) -> PyObjectId:
         """
         Decode JWT and return subject (user_id).
+        - Tokens that were already verified are served from token_cache until their exp.
         """
+        cached_user_id = self.token_cache.get(token)
+        if cached_user_id is not None:
+            return cached_user_id
+
         try:
             payload = jwt.decode(
                 token,
@@ -81,9 +90,16 @@ class AuthJwtCsrt:
             sub = payload.get("sub")
             if not sub:
                 raise InvalidTokenError("JWT 'sub' claim is missing")
-            return PyObjectId(sub)
+            user_id = PyObjectId(sub)
+            self.token_cache.put(token, user_id, int(payload["exp"]))
+            return user_id
 
         except jwt.ExpiredSignatureError:
             raise TokenExpiredError("The JWT has expired")
         except (jwt.InvalidSignatureError, jwt.DecodeError, jwt.InvalidTokenError): 
             raise InvalidTokenError("JWT is invalid")
+
+@lru_cache(maxsize=1)
+def get_auth_jwt_csrt() -> AuthJwtCsrt:
+    """Return the process-wide AuthJwtCsrt instance."""
+    return AuthJwtCsrt()
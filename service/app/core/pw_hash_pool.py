@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, TypeVar
+import core.const as const
+from core.errors import TooManyRequestsError
+
+T = TypeVar("T")
+
+class PasswordHashPool:
+    """
+    Dedicated, size-limited thread pool for bcrypt hashing/verification.
+    bcrypt releases the GIL, so running it here keeps the event loop free.
+    Jobs beyond max_pending are rejected immediately instead of queueing up.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = const.PW_HASH_POOL_MAX_WORKERS,
+        max_pending: int = const.PW_HASH_POOL_MAX_PENDING,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pw-hash")
+        # counters below are also updated from worker threads
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        # metrics
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(*args) on the pool; raise TooManyRequestsError if the queue is full."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise TooManyRequestsError("Too many authentication attempts in progress")
+            self._pending += 1
+
+        enqueued_at = time.perf_counter()
+
+        def job() -> T:
+            self._record_wait(time.perf_counter() - enqueued_at)
+            return fn(*args)
+
+        try:
+            future = self._executor.submit(job)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # pending follows the job itself, not the caller: a cancelled caller does not free
+        # the slot while its job is still queued or running
+        future.add_done_callback(self._job_done)
+        return await asyncio.wrap_future(future)
+
+    def _job_done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled() and future.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def _record_wait(self, waited: float) -> None:
+        with self._lock:
+            self.started += 1
+            self.wait_seconds_total += waited
+            if waited > self.wait_seconds_max:
+                self.wait_seconds_max = waited
+
+    def stats(self) -> dict:
+        """Return a snapshot of pool metrics."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_seconds_avg": self.wait_seconds_total / self.started if self.started else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+pw_hash_pool = PasswordHashPool()
@@ -0,0 +1,14 @@
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+class ModelJSONResponse(Response):
+    """
+    JSON response of an already built response model, serialized once by pydantic-core.
+    Returning it from a route skips FastAPI's response_model round trip
+    (model_dump -> validate again -> serialize -> json.dumps); response_model is still used for the OpenAPI schema.
+    """
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return to_json(content)
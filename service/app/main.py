@@ -1,13 +1,31 @@
+import logging
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 import uvicorn
+from pymongo import errors as mongo_errors
 import core.config as config
 from fastapi.middleware.cors import CORSMiddleware
-from repositories.session import client
+from repositories.session import client, get_db
+from repositories.word_repository import WordRepository
+from repositories.indexes import ensure_indexes, missing_unique_indexes, report_indexes
+from services.suggest_index import suggest_index
+from services.deepseek_client import get_deepseek_client, close_deepseek_client
+from core.pw_hash_pool import pw_hash_pool
+from core.jwt_auth import get_auth_jwt_csrt
 from routes.auth import router as auth_router
 from routes.word import router as word_router
 from core.exception_handler import register_exception_handlers
+from core.instrumentation import MetricsMiddleware
+from core.metrics import REGISTRY, StatsGauges
+from services.ai_entry_cache import ai_entry_cache
+from services.generativeAI_service import generation_flight
+from services.word_list_cache import word_list_cache
+from services.suggest_cache import suggest_cache
+from services.popular_words import popular_words_refresher
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,18 +35,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth_router)
 app.include_router(word_router)
 
 register_exception_handlers(app)
 
+REGISTRY.register(StatsGauges("pw_hash_pool", "Password hashing pool stats.", pw_hash_pool.stats))
+REGISTRY.register(StatsGauges("verified_token_cache", "Verified JWT cache stats.", lambda: get_auth_jwt_csrt().token_cache.stats()))
+REGISTRY.register(StatsGauges("suggest_index", "Suggest index stats.", lambda: {"words": len(suggest_index), "loaded": int(suggest_index.loaded)}))
+REGISTRY.register(StatsGauges("suggest_cache", "Suggest result cache stats.", suggest_cache.stats))
+REGISTRY.register(StatsGauges("ai_entry_cache", "AI generated entry cache stats.", ai_entry_cache.stats))
+REGISTRY.register(StatsGauges("word_list_cache", "Rendered word list cache stats.", word_list_cache.stats))
+REGISTRY.register(StatsGauges("popular_words", "Popular words refresher stats.", popular_words_refresher.stats))
+REGISTRY.register(StatsGauges("generation_flight", "Coalesced generation request stats.", generation_flight.stats))
+REGISTRY.register(StatsGauges("deepseek_client", "DeepSeek API client stats.", lambda: get_deepseek_client().stats()))
+
+@app.on_event("startup")
+async def startup_event():
+    get_auth_jwt_csrt()
+    try:
+        get_deepseek_client()
+    except RuntimeError as e:
+        logger.warning("DeepSeek client is not configured: %s", e)
+    try:
+        await ensure_indexes(get_db())
+        # unused indexes are left to `python -m repositories.indexes --check`: access counters restart from zero with mongod
+        reports = await report_indexes(get_db(), include_unused=False)
+        for col_name, report in reports.items():
+            if report["missing"]:
+                logger.warning("missing indexes on %s: %s", col_name, report["missing"])
+    except mongo_errors.PyMongoError as e:
+        logger.warning("failed to ensure indexes: %s", e)
+    else:
+        # register/delete rely on the unique indexes to reject duplicates: do not serve without them
+        missing_unique = missing_unique_indexes(reports)
+        if missing_unique:
+            raise RuntimeError(
+                f"unique indexes are missing: {missing_unique}; "
+                "merge the existing duplicates with `python -m repositories.indexes --dedupe`"
+            )
+    try:
+        await suggest_index.load(WordRepository(get_db()).iter_records())
+    except mongo_errors.PyMongoError as e:
+        logger.warning("failed to load suggest index, falling back to regex search: %s", e)
+    popular_words_refresher.start(get_db())
+
 @app.on_event("shutdown")
-def shutdown_event():
-    client.close()
+async def shutdown_event():
+    await popular_words_refresher.stop()
+    await client.close()
+    await close_deepseek_client()
+    pw_hash_pool.shutdown()
 
 @app.get("/", status_code=200)
 def root():
     return "成功！"
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text format metrics of this worker process."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=int(config.SERVICE_PORT), reload=True)
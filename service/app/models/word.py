@@ -1,3 +1,4 @@
+from typing import NamedTuple
 from pydantic import BaseModel, ConfigDict, conint, Field
 from core.oid import PyObjectId
 
@@ -15,3 +16,27 @@ class WordModel(BaseModel):
         json_encoders={PyObjectId: str},
     )
 
+# fields read by WordRecord.from_doc
+WORD_RECORD_PROJECTION = {"details.spelling": 1, "details.meaning": 1, "registration_count": 1}
+
+class WordRecord(NamedTuple):
+    """
+    Compact read-only projection of a word item for the list / suggest paths.
+    A tuple instead of a Pydantic model, so large candidate sets stay cheap to build and hold.
+    """
+    id: PyObjectId
+    spelling: str
+    meaning: str | None
+    registration_count: int
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "WordRecord":
+        """Build from a 'words' document read with WORD_RECORD_PROJECTION."""
+        details = doc["details"]
+        return cls(doc["_id"], details["spelling"], details.get("meaning"), doc.get("registration_count", 0))
+
+    @classmethod
+    def from_model(cls, word_model: WordModel) -> "WordRecord":
+        if word_model.id is None:
+            raise ValueError("word_model has no id")
+        return cls(word_model.id, word_model.details.spelling, word_model.details.meaning, word_model.registration_count)
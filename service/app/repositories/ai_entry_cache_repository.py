@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
+import core.config as config
+
+AI_ENTRY_CACHE_COL = config.AI_ENTRY_CACHE_COLLECTION_NAME
+
+class AiEntryCacheRepository:
+    """
+    Data access layer for the AI generated entry cache collection.
+    Documents expire through a TTL index on created_at (see repositories/indexes.py).
+    """
+    def __init__(self, db: AsyncDatabase, collection_name: str = AI_ENTRY_CACHE_COL):
+        self.col: AsyncCollection = db[collection_name]
+
+    # --- create / update ---
+    async def upsert(self, key: str, spelling: str, prompt_version: str, entry: dict) -> None:
+        """ insert or overwrite the cached entry for key """
+        await self.col.replace_one(
+            {"_id": key},
+            {
+                "spelling": spelling,
+                "prompt_version": prompt_version,
+                "entry": entry,
+                "created_at": datetime.now(timezone.utc),
+            },
+            upsert=True,
+        )
+
+    # --- read ---
+    async def find(self, key: str) -> dict | None:
+        """ return {"entry": dict, "created_at": datetime} or None """
+        return await self.col.find_one({"_id": key}, projection={"_id": 0, "entry": 1, "created_at": 1})
+
+    # --- delete ---
+    async def delete_all(self, *, spelling: str | None = None) -> int:
+        """ delete cached entries (only the given spelling if provided) and return the number deleted """
+        query = {} if spelling is None else {"spelling": spelling}
+        res = await self.col.delete_many(query)
+        return res.deleted_count
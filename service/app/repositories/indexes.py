@@ -0,0 +1,177 @@
+"""
+Index management for users / user_word / words / AI entry cache / popular words collections.
+
+Indexes are ensured at application startup. It can also be run standalone
+(from service/app):
+
+    python -m repositories.indexes           # ensure indexes and print report
+    python -m repositories.indexes --check   # only print report (exit 1 if missing)
+    python -m repositories.indexes --dedupe  # merge duplicates that block the unique indexes, then ensure
+
+The write paths rely on the unique indexes to reject duplicate registrations, so startup refuses to run
+while one of them is missing (see missing_unique_indexes).
+"""
+import argparse
+import asyncio
+import json
+import logging
+from typing import Dict, List, Set
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+from pymongo import errors as mongo_errors
+from pymongo.asynchronous.database import AsyncDatabase
+import core.config as config
+import core.const as const
+
+logger = logging.getLogger(__name__)
+
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    config.USER_COLLECTION_NAME: [
+        # UserRepository.find(username=...)
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+    ],
+    config.USER_WORD_COLLECTION_NAME: [
+        # UserWordRepository.find(user_id, word_id) / find_all(user_id=...)
+        IndexModel([("user_id", ASCENDING), ("word_id", ASCENDING)], name="user_id_word_id_unique", unique=True),
+        # keyset pagination of a user's list: {user_id, _id > after} sorted by _id
+        IndexModel([("user_id", ASCENDING), ("_id", ASCENDING)], name="user_id_id"),
+    ],
+    config.WORD_COLLECTION_NAME: [
+        # WordRepository.find(word_details=...) / upsert_and_increment_registration_count
+        IndexModel([("details.spelling", ASCENDING), ("details.meaning", ASCENDING)], name="details_spelling_meaning_unique", unique=True),
+        # PopularWordRepository.refresh: top-N by registration_count without sorting the whole collection
+        IndexModel([("registration_count", DESCENDING), ("_id", ASCENDING)], name="registration_count_id"),
+    ],
+    config.AI_ENTRY_CACHE_COLLECTION_NAME: [
+        # expire cached AI generated entries
+        IndexModel([("created_at", ASCENDING)], name="created_at_ttl", expireAfterSeconds=const.AI_ENTRY_CACHE_TTL_SECONDS),
+        # AiEntryCacheRepository.delete_all(spelling=...)
+        IndexModel([("spelling", ASCENDING)], name="spelling"),
+    ],
+    config.POPULAR_WORDS_COLLECTION_NAME: [
+        # PopularWordRepository.find_top
+        IndexModel([("registration_count", DESCENDING), ("_id", ASCENDING)], name="registration_count_id"),
+    ],
+}
+
+async def ensure_indexes(db: AsyncDatabase) -> None:
+    """Create every declared index that does not exist yet."""
+    for col_name, models in INDEX_SPECS.items():
+        try:
+            await db[col_name].create_indexes(models)
+        except mongo_errors.OperationFailure as e:
+            # e.g. existing duplicates prevent a unique index from being built
+            logger.warning("failed to create indexes on %s: %s", col_name, e)
+
+async def report_indexes(db: AsyncDatabase, *, include_unused: bool = True) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Return {collection: {"missing": [...], "unused": [...]}}.
+    - missing: declared indexes whose key pattern does not exist
+    - unused: existing indexes (except _id_) with no access since the last mongod restart
+      (empty unless include_unused; the counters start at zero on every restart and for every new index,
+      so this is only meaningful after the service has been running for a while)
+    """
+    report: Dict[str, Dict[str, List[str]]] = {}
+    for col_name, models in INDEX_SPECS.items():
+        col = db[col_name]
+        existing = await col.index_information()
+        existing_keys = {tuple(tuple(k) for k in info["key"]) for info in existing.values()}
+
+        missing = [
+            model.document["name"] for model in models
+            if tuple(model.document["key"].items()) not in existing_keys
+        ]
+
+        unused: List[str] = []
+        if include_unused:
+            try:
+                cur = await col.aggregate([{"$indexStats": {}}])
+                async for stat in cur:
+                    if stat["name"] != "_id_" and stat["accesses"]["ops"] == 0:
+                        unused.append(stat["name"])
+            except mongo_errors.OperationFailure as e:
+                logger.warning("failed to get $indexStats on %s: %s", col_name, e)
+
+        report[col_name] = {"missing": missing, "unused": unused}
+    return report
+
+def missing_unique_indexes(report: Dict[str, Dict[str, List[str]]]) -> List[str]:
+    """Return "collection.index" for every declared unique index that is missing in report."""
+    return [
+        f"{col_name}.{model.document['name']}"
+        for col_name, models in INDEX_SPECS.items()
+        for model in models
+        if model.document.get("unique") and model.document["name"] in report.get(col_name, {}).get("missing", [])
+    ]
+
+async def _duplicate_groups(db: AsyncDatabase, col_name: str, fields: List[str]) -> List[List]:
+    """Return the _ids of each group of documents sharing the values of fields (oldest _id first)."""
+    pipeline = [
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": {f"k{i}": f"${f}" for i, f in enumerate(fields)}, "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ]
+    cur = await db[col_name].aggregate(pipeline, allowDiskUse=True)
+    return [doc["ids"] async for doc in cur]
+
+async def dedupe(db: AsyncDatabase) -> Dict[str, int]:
+    """
+    Merge the duplicates that prevent the unique indexes from being built (left by the old, racy register_word):
+    1. words with the same details: keep the oldest, point the links of the others at it, delete the others
+    2. user_word links with the same (user_id, word_id): keep the oldest, delete the others
+    3. recompute registration_count of every word touched above from its remaining links
+    Run it while the service is stopped.
+    """
+    words, user_words = db[config.WORD_COLLECTION_NAME], db[config.USER_WORD_COLLECTION_NAME]
+    touched: Set = set()
+
+    removed_words = 0
+    for ids in await _duplicate_groups(db, config.WORD_COLLECTION_NAME, ["details.spelling", "details.meaning"]):
+        keep, dups = ids[0], ids[1:]
+        await user_words.update_many({"word_id": {"$in": dups}}, {"$set": {"word_id": keep}})
+        removed_words += (await words.delete_many({"_id": {"$in": dups}})).deleted_count
+        touched.add(keep)
+
+    removed_links = 0
+    for ids in await _duplicate_groups(db, config.USER_WORD_COLLECTION_NAME, ["user_id", "word_id"]):
+        doc = await user_words.find_one({"_id": ids[0]}, projection={"word_id": 1})
+        removed_links += (await user_words.delete_many({"_id": {"$in": ids[1:]}})).deleted_count
+        if doc:
+            touched.add(doc["word_id"])
+
+    if touched:
+        counts = {word_id: 0 for word_id in touched}
+        cur = await user_words.aggregate([
+            {"$match": {"word_id": {"$in": list(touched)}}},
+            {"$group": {"_id": "$word_id", "n": {"$sum": 1}}},
+        ])
+        async for doc in cur:
+            counts[doc["_id"]] = doc["n"]
+        await words.bulk_write(
+            [UpdateOne({"_id": word_id}, {"$set": {"registration_count": n}}) for word_id, n in counts.items()],
+            ordered=False,
+        )
+
+    return {"removed_words": removed_words, "removed_links": removed_links, "recounted_words": len(touched)}
+
+async def _main(check_only: bool, dedupe_first: bool) -> int:
+    from repositories.session import client, get_db
+
+    try:
+        db = get_db()
+        if dedupe_first:
+            print(json.dumps(await dedupe(db), indent=2))
+        if not check_only:
+            await ensure_indexes(db)
+        report = await report_indexes(db)
+    finally:
+        await client.close()
+
+    print(json.dumps(report, indent=2))
+    return 1 if any(r["missing"] for r in report.values()) else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ensure and report MongoDB indexes.")
+    parser.add_argument("--check", action="store_true", help="only report missing/unused indexes")
+    parser.add_argument("--dedupe", action="store_true", help="merge duplicates blocking the unique indexes first (stop the service)")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(_main(args.check, args.dedupe)))
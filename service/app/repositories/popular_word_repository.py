@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo import errors as mongo_errors
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
+import core.config as config
+from models.word import WordRecord
+
+POPULAR_WORDS_COL = config.POPULAR_WORDS_COLLECTION_NAME
+WORD_COL = config.WORD_COLLECTION_NAME
+REFRESH_LEASE_ID = "refresh"
+
+class PopularWordRepository:
+    """
+    Data access layer for the materialized 'popular words' collection:
+    the top-N word items by registration_count, in the same shape as 'words' (_id is the word id).
+    The refresh lease lives in '<collection>_lease'.
+    """
+    def __init__(self, db: AsyncDatabase, collection_name: str = POPULAR_WORDS_COL):
+        self.db = db
+        self.col: AsyncCollection = db[collection_name]
+        self.leases: AsyncCollection = db[f"{collection_name}_lease"]
+
+    # --- update ---
+    async def acquire_refresh_lease(self, owner: str, seconds: float) -> bool:
+        """
+        Take (or extend) the refresh lease for `seconds` unless another owner holds an unexpired one.
+        Returns True if `owner` holds the lease.
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            await self.leases.find_one_and_update(
+                {"_id": REFRESH_LEASE_ID, "$or": [{"owner": owner}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=seconds)}},
+                upsert=True,
+            )
+        except mongo_errors.DuplicateKeyError:
+            # the lease exists and is held by someone else, so the upsert tried to insert a second one
+            return False
+        return True
+
+    async def refresh(self, size: int) -> int:
+        """
+        Rebuild the collection from 'words' server-side ($sort/$limit on the registration_count index + $merge),
+        then drop the items that fell out of the top-N. Returns the number of items.
+        Only one refresh may run at a time (hold the refresh lease): the final delete removes every row
+        written by another refresh, so two overlapping ones would empty each other's result.
+        """
+        refresh_id = ObjectId()
+        pipeline = [
+            {"$match": {"registration_count": {"$gt": 0}}},
+            {"$sort": {"registration_count": -1, "_id": 1}},
+            {"$limit": size},
+            {"$project": {
+                "details.spelling": 1,
+                "details.meaning": 1,
+                "registration_count": 1,
+                "refresh_id": {"$literal": refresh_id},
+            }},
+            {"$merge": {"into": self.col.name, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+        ]
+        cur = await self.db[WORD_COL].aggregate(pipeline)
+        await cur.to_list()
+        await self.col.delete_many({"refresh_id": {"$ne": refresh_id}})
+        return await self.col.count_documents({})
+
+    # --- read ---
+    async def find_top(self, limit: int) -> List[WordRecord]:
+        """ top `limit` items by registration_count (indexed) """
+        cur = self.col.find({}).sort([("registration_count", DESCENDING), ("_id", ASCENDING)]).limit(limit)
+        return [WordRecord.from_doc(doc) async for doc in cur]
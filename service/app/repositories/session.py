@@ -1,9 +1,36 @@
+from typing import Awaitable, Callable, TypeVar
 from core.config import MONGO_DB_URL, DB_NAME
-from pymongo import MongoClient
-from pymongo.database import Database
+from core.instrumentation import MongoCommandMetrics
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.asynchronous.database import AsyncDatabase
 
-client = MongoClient(MONGO_DB_URL)
+T = TypeVar("T")
 
-def get_db() -> Database:
-    db: Database = client[DB_NAME]
+client: AsyncMongoClient = AsyncMongoClient(MONGO_DB_URL, event_listeners=[MongoCommandMetrics()])
+_transactions_supported: bool | None = None
+
+def get_db() -> AsyncDatabase:
+    db: AsyncDatabase = client[DB_NAME]
     return db
+
+async def transactions_supported(db: AsyncDatabase) -> bool:
+    """Return True if the deployment is a replica set or sharded cluster (checked once)."""
+    global _transactions_supported
+    if _transactions_supported is None:
+        hello = await db.client.admin.command("hello")
+        _transactions_supported = "setName" in hello or hello.get("msg") == "isdbgrid"
+    return _transactions_supported
+
+async def run_in_transaction(
+    db: AsyncDatabase,
+    callback: Callable[[AsyncClientSession | None], Awaitable[T]],
+) -> T:
+    """
+    Run callback(session) inside a multi-document transaction when the deployment supports it.
+    On a standalone mongod callback(None) is run without a session, so it must compensate on failure itself.
+    """
+    if not await transactions_supported(db):
+        return await callback(None)
+    async with db.client.start_session() as session:
+        return await session.with_transaction(callback)
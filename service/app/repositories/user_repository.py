@@ -1,5 +1,6 @@
-from pymongo.database import Database
-from pymongo.collection import Collection
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
 import core.config as config
 from models.user import UserModel 
 from core.oid import PyObjectId
@@ -8,18 +9,18 @@ USER_COL = config.USER_COLLECTION_NAME
 
 class UserRepository:
     """Data access layer for users collection."""
-    def __init__(self, db: Database, collection_name: str = USER_COL):
-        self.col: Collection = db[collection_name]
+    def __init__(self, db: AsyncDatabase, collection_name: str = USER_COL):
+        self.col: AsyncCollection = db[collection_name]
 
     # --- create ---
-    def create(self, user: UserModel) -> PyObjectId:
+    async def create(self, user: UserModel) -> PyObjectId:
         """Insert a new user item"""
         doc = user.model_dump(by_alias=True, exclude_none=True)
-        res = self.col.insert_one(doc)
+        res = await self.col.insert_one(doc)
         return res.inserted_id
 
     # --- read ---
-    def find(
+    async def find(
         self,
         *, 
         user_id: PyObjectId | None = None,
@@ -35,5 +36,20 @@ class UserRepository:
         if username is not None: 
             query["username"] = username 
 
-        doc = self.col.find_one(query)
+        doc = await self.col.find_one(query)
         return UserModel.model_validate(doc) if doc else None
+
+    async def get_word_list_version(self, user_id: PyObjectId) -> int:
+        """ version of the user's word list (0 if it has never changed) """
+        doc = await self.col.find_one({"_id": user_id}, projection={"_id": 0, "word_list_version": 1})
+        return (doc or {}).get("word_list_version", 0)
+
+    # --- update ---
+    async def increment_word_list_version(
+        self,
+        user_id: PyObjectId,
+        *,
+        session: AsyncClientSession | None = None,
+    ) -> None:
+        """ mark the user's word list as changed (invalidates cached lists and ETags in every worker) """
+        await self.col.update_one({"_id": user_id}, {"$inc": {"word_list_version": 1}}, session=session)
@@ -1,25 +1,63 @@
-from typing import List
-from pymongo.database import Database
-from pymongo.collection import Collection
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Set
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo import errors as mongo_errors
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
 import core.config as config
+import core.const as const
 from core.oid import PyObjectId
 from models.user_word import UserWordModel
 
 USER_WORD_COL = config.USER_WORD_COLLECTION_NAME 
+WORD_COL = config.WORD_COLLECTION_NAME
 
 class UserWordRepository:
-    def __init__(self, db: Database, collection_name: str = USER_WORD_COL):
-        self.col: Collection = db[collection_name]
+    def __init__(self, db: AsyncDatabase, collection_name: str = USER_WORD_COL):
+        self.col: AsyncCollection = db[collection_name]
 
     # --- create ---
-    def create(self, user_word_model: UserWordModel) -> PyObjectId:
-        """Create (user_id, word_id) link and return id."""
+    async def create(
+        self, 
+        user_word_model: UserWordModel,
+        *,
+        session: AsyncClientSession | None = None,
+    ) -> PyObjectId:
+        """
+        Create (user_id, word_id) link and return id.
+        Raises DuplicateKeyError if the link already exists (unique (user_id, word_id) index).
+        """
         doc = user_word_model.model_dump(by_alias=True, exclude_none=True)
-        res = self.col.insert_one(doc)
+        res = await self.col.insert_one(doc, session=session)
         return res.inserted_id
 
+    async def create_many(
+        self,
+        user_word_models: List[UserWordModel],
+        *,
+        session: AsyncClientSession | None = None,
+    ) -> Set[int]:
+        """
+        Create links with one unordered insert_many.
+        Returns the positions whose link already existed (duplicate key); any other write error is raised.
+        """
+        if not user_word_models:
+            return set()
+
+        docs = [m.model_dump(by_alias=True, exclude_none=True) for m in user_word_models]
+        try:
+            await self.col.insert_many(docs, ordered=False, session=session)
+        except mongo_errors.BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != 11000 for err in errors):
+                raise
+            return {err["index"] for err in errors}
+        return set()
+
     # --- read ---
-    def find(
+    async def find(
         self, 
         *, 
         user_word_id: PyObjectId | None = None,
@@ -29,23 +67,28 @@ class UserWordRepository:
         """ find a user_word matching to the condition """
         if user_word_id is not None: 
             query = {"_id": user_word_id}
-            doc = self.col.find_one(query)
+            doc = await self.col.find_one(query)
             return UserWordModel.model_validate(doc) if doc else None
 
         if not (user_id and word_id): 
             raise ValueError("both user_id and word_id must be provided")
 
         query = {"user_id": user_id, "word_id": word_id}
-        doc = self.col.find_one(query)
+        doc = await self.col.find_one(query)
         return UserWordModel.model_validate(doc) if doc else None
 
-    def find_all(
+    async def find_all(
         self, 
         *,
         user_id: PyObjectId | None = None, 
-        word_id: PyObjectId | None = None
+        word_id: PyObjectId | None = None,
+        limit: int | None = None,
+        after: PyObjectId | None = None,
     ) -> List[UserWordModel]:
-        """ find user_word list matching to the condition """
+        """ 
+        find user_word list matching to the condition 
+        - keyset pagination: items are ordered by _id, only items with _id > after are returned (at most limit)
+        """
 
         if not user_id and not word_id: 
             raise ValueError("either user_id and word_id must be provided")
@@ -55,12 +98,136 @@ class UserWordRepository:
             query["user_id"] = user_id
         if word_id is not None: 
             query["word_id"] = word_id
+        if after is not None: 
+            query["_id"] = {"$gt": after}
             
-        cur = self.col.find(query)
-        return [UserWordModel.model_validate(doc) for doc in cur]
+        cur = self.col.find(query).sort("_id", ASCENDING)
+        if limit is not None: 
+            cur = cur.limit(limit)
+        return [UserWordModel.model_validate(doc) async for doc in cur]
+
+    async def find_many(
+        self,
+        *,
+        user_id: PyObjectId,
+        user_word_ids: List[PyObjectId],
+    ) -> List[UserWordModel]:
+        """ find the user's links among user_word_ids """
+        cur = self.col.find({"_id": {"$in": user_word_ids}, "user_id": user_id})
+        return [UserWordModel.model_validate(doc) async for doc in cur]
+
+    async def find_registered_word_ids(
+        self,
+        *,
+        user_id: PyObjectId,
+        word_ids: List[PyObjectId],
+    ) -> Set[PyObjectId]:
+        """ return the word_ids among word_ids the user has already registered """
+        cur = self.col.find({"user_id": user_id, "word_id": {"$in": word_ids}}, projection={"_id": 0, "word_id": 1})
+        return {doc["word_id"] async for doc in cur}
+
+    async def find_word_list(
+        self, 
+        *, 
+        user_id: PyObjectId,
+        limit: int | None = None,
+        after: PyObjectId | None = None,
+    ) -> List[dict]:
+        """
+        Join user_word to words server-side and return
+        [{"user_word_id": str, "spelling": str | None, "meaning": str | None}, ...] in one round trip.
+        spelling is None if the linked word item does not exist.
+        """
+        return [doc async for doc in self.iter_word_list(user_id=user_id, limit=limit, after=after)]
+
+    async def iter_word_list(
+        self, 
+        *, 
+        user_id: PyObjectId,
+        limit: int | None = None,
+        after: PyObjectId | None = None,
+        with_usage_example: bool = False,
+    ) -> AsyncIterator[dict]:
+        """
+        Same as find_word_list but yields items straight from the cursor (ordered by user_word _id).
+        with_usage_example adds "example_sentence" and "example_sentence_translation" to each item.
+        """
+        match: dict = {"user_id": user_id}
+        if after is not None: 
+            match["_id"] = {"$gt": after}
+
+        pipeline: List[dict] = [{"$match": match}, {"$sort": {"_id": 1}}]
+        if limit is not None: 
+            pipeline.append({"$limit": limit})
+        pipeline += [
+            {"$lookup": {
+                "from": WORD_COL,
+                "localField": "word_id",
+                "foreignField": "_id",
+                "pipeline": [{"$project": {"_id": 0, "details.spelling": 1, "details.meaning": 1}}],
+                "as": "word",
+            }},
+            {"$unwind": {"path": "$word", "preserveNullAndEmptyArrays": True}},
+        ]
+        project = {
+            "_id": 0,
+            "user_word_id": {"$toString": "$_id"},
+            "spelling": "$word.details.spelling",
+            "meaning": "$word.details.meaning",
+        }
+        if with_usage_example: 
+            project["example_sentence"] = "$usage_example.sentence"
+            project["example_sentence_translation"] = "$usage_example.translation"
+        pipeline.append({"$project": project})
+        cur = await self.col.aggregate(pipeline)
+        async for doc in cur: 
+            yield doc
 
     # --- delete ---
-    def delete(self, user_word_id: PyObjectId) -> UserWordModel | None: 
-        doc = self.col.find_one_and_delete({"_id": user_word_id})
+    async def delete(
+        self, 
+        user_word_id: PyObjectId,
+        *,
+        session: AsyncClientSession | None = None,
+    ) -> UserWordModel | None: 
+        doc = await self.col.find_one_and_delete({"_id": user_word_id}, session=session)
         return UserWordModel.model_validate(doc) if doc else None
 
+    async def delete_many(
+        self,
+        *,
+        user_id: PyObjectId,
+        user_word_ids: List[PyObjectId],
+        session: AsyncClientSession | None = None,
+    ) -> int:
+        """ delete the user's links among user_word_ids and return the deleted count """
+        res = await self.col.delete_many({"_id": {"$in": user_word_ids}, "user_id": user_id}, session=session)
+        return res.deleted_count
+
+    async def delete_claimed(
+        self,
+        *,
+        user_id: PyObjectId,
+        user_word_ids: List[PyObjectId],
+    ) -> List[PyObjectId]:
+        """
+        delete the user's links among user_word_ids without a transaction and return the ids this call deleted,
+        in three round trips: mark them with a fresh del_token, read the marked ids back, delete them.
+        Links already marked by a concurrent call are left to it; a mark older than
+        USER_WORD_DELETE_CLAIM_SECONDS (the claimer died in between) can be taken over.
+        """
+        token = ObjectId()
+        stale = ObjectId.from_datetime(datetime.now(timezone.utc) - timedelta(seconds=const.USER_WORD_DELETE_CLAIM_SECONDS))
+        await self.col.update_many(
+            {
+                "_id": {"$in": user_word_ids},
+                "user_id": user_id,
+                "$or": [{"del_token": {"$exists": False}}, {"del_token": {"$lt": stale}}],
+            },
+            {"$set": {"del_token": token}},
+        )
+        # _id narrows both to the _id index
+        claimed = [doc["_id"] async for doc in self.col.find({"_id": {"$in": user_word_ids}, "del_token": token}, projection={"_id": 1})]
+        if claimed:
+            await self.col.delete_many({"_id": {"$in": claimed}, "del_token": token})
+        return claimed
@@ -1,27 +1,54 @@
-from typing import List
-from pymongo import ReturnDocument
-from pymongo.database import Database
-from pymongo.collection import Collection
+from typing import AsyncIterator, Dict, List, Tuple
+from pymongo import ReturnDocument, UpdateOne
+from pymongo import errors as mongo_errors
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
 import core.config as config
 from core.oid import PyObjectId 
-from models.word import WordDetails, WordModel
+from models.word import WORD_RECORD_PROJECTION, WordDetails, WordModel, WordRecord
 
 WORD_COL = config.WORD_COLLECTION_NAME
 
 class WordRepository:
     """Data access layer for 'words' collection."""
-    def __init__(self, db: Database, collection_name: str = WORD_COL):
-        self.col: Collection = db[collection_name]
+    def __init__(self, db: AsyncDatabase, collection_name: str = WORD_COL):
+        self.col: AsyncCollection = db[collection_name]
 
     # --- create ---
-    def create(self, word_model: WordModel) -> PyObjectId:
+    async def create(self, word_model: WordModel) -> PyObjectId:
         """ insert a new word item """
         doc = word_model.model_dump(by_alias=True, exclude_none=True)
-        res = self.col.insert_one(doc)
+        res = await self.col.insert_one(doc)
         return res.inserted_id
 
+    async def bulk_upsert_details(self, word_details_list: List[WordDetails]) -> Tuple[int, int]:
+        """
+        Insert a word item (registration_count 0) for every details that does not exist yet, in one unordered bulk_write.
+        Returns (inserted, existing). Duplicate key errors from concurrent inserts of the same details count as existing.
+        """
+        if not word_details_list:
+            return 0, 0
+
+        ops = [
+            UpdateOne(
+                {"details.spelling": d.spelling, "details.meaning": d.meaning},
+                {"$setOnInsert": {"registration_count": 0}},
+                upsert=True,
+            )
+            for d in word_details_list
+        ]
+        try:
+            res = await self.col.bulk_write(ops, ordered=False)
+            inserted = res.upserted_count
+        except mongo_errors.BulkWriteError as e:
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
+            inserted = e.details.get("nUpserted", 0)
+        return inserted, len(word_details_list) - inserted
+
     # --- read ---
-    def find(
+    async def find(
         self, 
         *, 
         word_id: PyObjectId | None = None, 
@@ -35,50 +62,117 @@ class WordRepository:
         if word_id is not None: 
             query["_id"] = word_id
         if word_details is not None: 
-            query["details"] = word_details.model_dump(by_alias=True, exclude_none=True)
+            # match on dotted fields so the (details.spelling, details.meaning) index is used
+            query["details.spelling"] = word_details.spelling
+            query["details.meaning"] = word_details.meaning
 
-        doc = self.col.find_one(query)
+        doc = await self.col.find_one(query)
         return WordModel.model_validate(doc) if doc else None
 
-    def find_all(
+    async def find_all(
         self, 
         *, 
         word_ids: List[PyObjectId]
     ) -> List[WordModel]:
         cur = self.col.find({"_id": {"$in": word_ids}})
-        return [WordModel.model_validate(doc) for doc in cur]
+        return [WordModel.model_validate(doc) async for doc in cur]
+
+    async def find_all_by_details(self, word_details_list: List[WordDetails]) -> List[WordModel]:
+        """ find every word item matching one of the details in one round trip """
+        if not word_details_list:
+            return []
+        query = {"$or": [
+            {"details.spelling": d.spelling, "details.meaning": d.meaning} for d in word_details_list
+        ]}
+        cur = self.col.find(query)
+        return [WordModel.model_validate(doc) async for doc in cur]
 
-    def find_by_word_subseq(
+    async def iter_records(self) -> AsyncIterator[WordRecord]:
+        """ iterate over every word item as a compact record (only the projected fields are fetched) """
+        async for doc in self.col.find({}, projection=WORD_RECORD_PROJECTION):
+            yield WordRecord.from_doc(doc)
+
+    async def find_by_word_subseq(
         self,
         subseq_pattern: str,
         max_num: int,
         case_insensitive: bool = True
-    ) -> List[WordModel]:
+    ) -> List[WordRecord]:
         """
         Build a MongoDB regex filter from a subsequence pattern and delegate to regex finder.
+        Returns compact records (only the projected fields are fetched).
         """
         options = "i" if case_insensitive else ""
         regex = {"$regex": subseq_pattern, "$options": options}
-        cur = self.col.find({"details.spelling": regex}).limit(max_num)
-        return [WordModel.model_validate(doc) for doc in cur]
+        cur = self.col.find({"details.spelling": regex}, projection=WORD_RECORD_PROJECTION).limit(max_num)
+        return [WordRecord.from_doc(doc) async for doc in cur]
 
     # --- update ---
-    def increment_registration_count(self, word_id: PyObjectId) -> None: 
-        self.col.find_one_and_update(
+    async def increment_registration_count(self, word_id: PyObjectId) -> None: 
+        await self.col.find_one_and_update(
             {"_id": word_id},
             {"$inc": {"registration_count": 1}},
             return_document=ReturnDocument.AFTER,
             projection={"_id": 1},
         )
 
-    def decrement_registration_count(self, word_id: PyObjectId) -> None:
+    async def upsert_and_increment_registration_count(
+        self,
+        word_details: WordDetails,
+        *,
+        session: AsyncClientSession | None = None,
+    ) -> WordModel:
+        """
+        Insert the word item if it does not exist and increment its registration_count in one round trip.
+        Relies on the unique (details.spelling, details.meaning) index; a concurrent upsert of the same
+        details raises DuplicateKeyError once, in which case the update is retried as a plain match.
+        """
+        query = {"details.spelling": word_details.spelling, "details.meaning": word_details.meaning}
+        update = {"$inc": {"registration_count": 1}}
+        try:
+            doc = await self.col.find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.AFTER, session=session,
+            )
+        except mongo_errors.DuplicateKeyError:
+            doc = await self.col.find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.AFTER, session=session,
+            )
+        return WordModel.model_validate(doc)
+
+    async def bulk_increment_registration_counts(
+        self,
+        deltas: Dict[PyObjectId, int],
+        *,
+        session: AsyncClientSession | None = None,
+    ) -> None:
+        """
+        Apply aggregated registration_count deltas (word_id -> delta) with one unordered bulk_write.
+        A negative delta is only applied if registration_count stays >= 0.
+        """
+        ops = [
+            UpdateOne(
+                {"_id": word_id} if delta > 0 else {"_id": word_id, "registration_count": {"$gte": -delta}},
+                {"$inc": {"registration_count": delta}},
+            )
+            for word_id, delta in deltas.items() if delta
+        ]
+        if ops:
+            await self.col.bulk_write(ops, ordered=False, session=session)
+
+    async def decrement_registration_count(
+        self, 
+        word_id: PyObjectId,
+        *,
+        session: AsyncClientSession | None = None,
+    ) -> WordModel | None:
         """
         Decrement registered_count of a word document by word_id
-        regisited_count must be greater than 0
+        regisited_count must be greater than 0, otherwise nothing is updated and None is returned
         """
-        self.col.find_one_and_update(
-            {"_id": word_id},
+        doc = await self.col.find_one_and_update(
+            {"_id": word_id, "registration_count": {"$gt": 0}},
             {"$inc": {"registration_count": -1}},
             return_document=ReturnDocument.AFTER,
-            projection={"_id": 1},
+            session=session,
         )
+        return WordModel.model_validate(doc) if doc else None
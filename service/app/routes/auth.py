@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Response, status
-from pymongo.database import Database
+from pymongo.asynchronous.database import AsyncDatabase
 from core.oid import PyObjectId
 from repositories.session import get_db
 from services.auth_service import AuthService
@@ -16,11 +16,11 @@ router = APIRouter(prefix="/user", tags=["auth"], responses=common_schemas.COMMO
 async def sign_in(
     payload: auth_schemas.SignInRequest,
     response: Response,
-    db: Database = Depends(get_db),
+    db: AsyncDatabase = Depends(get_db),
 ):
     svc = AuthService(db)
 
-    access_token = svc.create_access_token(payload)
+    access_token = await svc.create_access_token(payload)
 
     response.set_cookie(
         key="access_token",
@@ -39,10 +39,10 @@ async def sign_in(
 )
 async def sign_up(
     payload: auth_schemas.SignUpRequest, 
-    db: Database = Depends(get_db)
+    db: AsyncDatabase = Depends(get_db)
 ):
     svc = AuthService(db)
-    svc.sign_up(payload)
+    await svc.sign_up(payload)
     return
 
 @router.post(
@@ -1,27 +1,71 @@
-from fastapi import APIRouter, Depends
-from pymongo.database import Database
-from starlette.status import HTTP_200_OK, HTTP_204_NO_CONTENT
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pymongo.asynchronous.database import AsyncDatabase
+from starlette.status import HTTP_200_OK, HTTP_204_NO_CONTENT, HTTP_304_NOT_MODIFIED
+from core import const
 from core.oid import PyObjectId
+from core.responses import ModelJSONResponse
 import schemas.common_schemas as common_schemas
 from repositories.session import get_db
 from services.word_service import WordService
 from services.auth_service import AuthService 
 from services.generativeAI_service import GenerativeAIService
+from services.word_export import EXPORT_MEDIA_TYPES
+from services.word_list_cache import word_list_cache
 import schemas.word_schemas as word_schemas
 
 router = APIRouter(prefix="/word", tags=["word"], responses=common_schemas.COMMON_ERROR_RESPONSES)
 
+# the list is per-user, and must be revalidated (If-None-Match) before reuse
+WORD_LIST_CACHE_CONTROL = "private, no-cache"
+
 @router.get(
     "/get_user_word_list", 
     operation_id="get_user_word_list", 
     response_model=word_schemas.GetWordListResponse, 
+    responses={HTTP_304_NOT_MODIFIED: {"description": "The list is unchanged since the ETag in If-None-Match"}},
 )
 async def get_word_list(
+    limit: int | None = Query(default=None, ge=1, le=const.USER_WORD_LIST_MAX_LIMIT),
+    after: str | None = Query(default=None, description="next_cursor of the previous page"),
+    stream: bool = Query(default=False, description="stream items as NDJSON instead of a single JSON"),
+    if_none_match: str | None = Header(default=None),
     user_id: PyObjectId = Depends(AuthService.get_user_id_from_cookie),
-    db: Database = Depends(get_db)
+    db: AsyncDatabase = Depends(get_db)
 ):
     svc = WordService(db)
-    return svc.get_word_list_by_user_id(user_id)
+    if stream: 
+        return StreamingResponse(
+            svc.stream_word_list_by_user_id(user_id, limit=limit, after=after),
+            media_type="application/x-ndjson",
+        )
+
+    # this page is unchanged since the client's copy: answer with a single read of the user's list version
+    key = await svc.get_word_list_cache_key(user_id, limit=limit, after=after)
+    headers = {"ETag": word_list_cache.etag(key), "Cache-Control": WORD_LIST_CACHE_CONTROL}
+    if word_list_cache.is_not_modified(key, if_none_match): 
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    body = await svc.get_word_list_json(key)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get(
+    "/export", 
+    operation_id="export_user_words", 
+    response_description="every word item of the current user with its usage example (csv / jsonl / Anki TSV)", 
+    response_class=StreamingResponse, 
+)
+async def export_user_words(
+    format: word_schemas.ExportFormat = Query(default="csv"),
+    user_id: PyObjectId = Depends(AuthService.get_user_id_from_cookie),
+    db: AsyncDatabase = Depends(get_db)
+):
+    svc = WordService(db)
+    media_type, ext = EXPORT_MEDIA_TYPES[format]
+    return StreamingResponse(
+        svc.stream_word_export(user_id, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="words.{ext}"'},
+    )
 
 @router.post(
     "/get_word_content", 
@@ -30,10 +74,23 @@ async def get_word_list(
 )
 async def get_word_content(
     payload: word_schemas.GetWordContentRequest, 
-    db: Database = Depends(get_db)
+    db: AsyncDatabase = Depends(get_db)
 ):
     svc = WordService(db)
-    return svc.get_word_content(payload)
+    return ModelJSONResponse(await svc.get_word_content(payload))
+
+@router.get(
+    "/popular_words", 
+    operation_id="popular_words", 
+    response_description="most registered word items (refreshed in the background)", 
+    response_model=word_schemas.PopularWordsResponse, 
+)
+async def popular_words(
+    limit: int = Query(default=const.POPULAR_WORDS_SIZE, ge=1, le=const.POPULAR_WORDS_SIZE),
+    db: AsyncDatabase = Depends(get_db),
+):
+    svc = WordService(db)
+    return ModelJSONResponse(await svc.get_popular_words(limit))
 
 @router.post(
     "/suggest_words", 
@@ -43,10 +100,10 @@ async def get_word_content(
 )
 async def suggest_words(
     payload: word_schemas.SuggestWordsRequest,
-    db: Database = Depends(get_db),
+    db: AsyncDatabase = Depends(get_db),
 ):
     svc = WordService(db)
-    return svc.generate_word_suggestion(payload)
+    return ModelJSONResponse(await svc.generate_word_suggestion(payload))
 
 @router.post(
     "/generate_new_word_entry", 
@@ -57,9 +114,42 @@ async def suggest_words(
 async def generate_new_word_entry( 
     payload: word_schemas.GenerateNewWordEntryRequest, 
     _user_id: str = Depends(AuthService.get_user_id_from_cookie), 
+    db: AsyncDatabase = Depends(get_db),
+):
+    svc = GenerativeAIService(db)
+    return ModelJSONResponse(await svc.generate_word_entry(payload))
+
+@router.post(
+    "/generate_new_word_entry_stream", 
+    operation_id="generate_new_word_entry_stream", 
+    response_description="generate new word entry with AI, streamed as Server-Sent Events (field / done / error)", 
+    response_class=StreamingResponse,
+)
+async def generate_new_word_entry_stream( 
+    payload: word_schemas.GenerateNewWordEntryRequest, 
+    _user_id: str = Depends(AuthService.get_user_id_from_cookie), 
+    db: AsyncDatabase = Depends(get_db),
 ):
-    svc = GenerativeAIService()
-    return svc.generate_word_entry(payload)
+    svc = GenerativeAIService(db)
+    return StreamingResponse(
+        svc.stream_word_entry(payload),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post(
+    "/generate_new_word_entries", 
+    operation_id="generate_new_word_entries", 
+    response_description="generate new word entries for many words with AI in one request", 
+    response_model=word_schemas.BatchGenerateNewWordEntryResponse, 
+)
+async def generate_new_word_entries( 
+    payload: word_schemas.BatchGenerateNewWordEntryRequest, 
+    _user_id: str = Depends(AuthService.get_user_id_from_cookie), 
+    db: AsyncDatabase = Depends(get_db),
+):
+    svc = GenerativeAIService(db)
+    return ModelJSONResponse(await svc.generate_word_entries(payload))
 
 @router.post(
     "/register_word", 
@@ -70,10 +160,10 @@ async def generate_new_word_entry(
 async def register_word(
     payload: word_schemas.RegisterWordRequest,
     user_id: PyObjectId = Depends(AuthService.get_user_id_from_cookie),
-    db: Database = Depends(get_db),
+    db: AsyncDatabase = Depends(get_db),
 ):
     svc = WordService(db)
-    svc.register_word(payload, user_id)
+    await svc.register_word(payload, user_id)
     return 
 
 @router.post(
@@ -84,8 +174,50 @@ async def register_word(
 async def delete_word(
     payload: word_schemas.DeleteWordRequest, 
     _user_id: PyObjectId = Depends(AuthService.get_user_id_from_cookie), 
-    db: Database = Depends(get_db), 
+    db: AsyncDatabase = Depends(get_db), 
 ): 
     svc = WordService(db)
-    svc.delete_word(payload)
+    await svc.delete_word(payload)
     return
+
+@router.post(
+    "/register_words", 
+    operation_id="register_words", 
+    response_description="register many items for the current user", 
+    response_model=word_schemas.BulkWordOperationResponse, 
+)
+async def register_words(
+    payload: word_schemas.BulkRegisterWordsRequest,
+    user_id: PyObjectId = Depends(AuthService.get_user_id_from_cookie),
+    db: AsyncDatabase = Depends(get_db),
+):
+    svc = WordService(db)
+    return ModelJSONResponse(await svc.register_words(payload, user_id))
+
+@router.post(
+    "/register_words_csv", 
+    operation_id="register_words_csv", 
+    response_description="register items of a CSV (spelling, meaning, example_sentence, example_sentence_translation) for the current user", 
+    response_model=word_schemas.BulkWordOperationResponse, 
+    openapi_extra={"requestBody": {"required": True, "content": {"text/csv": {"schema": {"type": "string"}}}}},
+)
+async def register_words_csv(
+    request: Request,
+    user_id: PyObjectId = Depends(AuthService.get_user_id_from_cookie),
+    db: AsyncDatabase = Depends(get_db),
+):
+    svc = WordService(db)
+    return ModelJSONResponse(await svc.register_words_csv(await request.body(), user_id))
+
+@router.post(
+    "/delete_words", 
+    operation_id="delete_words", 
+    response_model=word_schemas.BulkWordOperationResponse, 
+)
+async def delete_words(
+    payload: word_schemas.BulkDeleteWordsRequest, 
+    user_id: PyObjectId = Depends(AuthService.get_user_id_from_cookie), 
+    db: AsyncDatabase = Depends(get_db), 
+): 
+    svc = WordService(db)
+    return ModelJSONResponse(await svc.delete_words(payload, user_id))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import List
+from typing import List, Literal
 
 from core import const
 
@@ -11,6 +11,16 @@ class GetWordListResponseBase(BaseModel):
 
 class GetWordListResponse(BaseModel):
     word_list: List[GetWordListResponseBase]
+    next_cursor: str | None = None  # pass as `after` to get the next page
+
+# --- export ---
+ExportFormat = Literal["csv", "jsonl", "anki"]
+
+class ExportWordItem(BaseModel): 
+    spelling: str
+    meaning: str | None = None
+    example_sentence: str | None = None
+    example_sentence_translation: str | None = None
 
 # --- user word detail --- 
 class GetWordContentRequest(BaseModel): 
@@ -26,7 +36,11 @@ class GetWordContentResponse(BaseModel):
 # --- suggest ---
 class SuggestWordsRequest(BaseModel): 
     input_str: str
-    max_num: int = 10 
+    max_num: int = Field(
+        default=const.MAX_NUM_WORD_SUGGEST,
+        ge=1,
+        le=const.MAX_NUM_WORD_SUGGEST_CANDIDATE,
+    )
 
 class SuggestWordsResponseBase(BaseModel): 
     word_id: str
@@ -36,6 +50,16 @@ class SuggestWordsResponseBase(BaseModel):
 class SuggestWordsResponse(BaseModel):
     word_list: List[SuggestWordsResponseBase]
 
+# --- popular words ---
+class PopularWordsResponseBase(BaseModel): 
+    word_id: str
+    spelling: str 
+    meaning: str | None = None 
+    registration_count: int
+
+class PopularWordsResponse(BaseModel):
+    word_list: List[PopularWordsResponseBase]
+
 # --- generate ---
 class GenerateNewWordEntryRequest(BaseModel): 
     spelling: str = Field(
@@ -58,6 +82,21 @@ class GenerateNewWordEntryResponse(BaseModel):
     example_sentence: str
     example_sentence_translation: str
 
+# --- batch generate ---
+class BatchGenerateNewWordEntryRequest(BaseModel): 
+    items: List[GenerateNewWordEntryRequest] = Field(
+        min_length=1,
+        max_length=const.MAX_NUM_BATCH_GENERATE,
+    )
+
+class BatchGenerateNewWordEntryResponseBase(BaseModel): 
+    index: int  # position in the request items
+    entry: GenerateNewWordEntryResponse | None = None
+    error: str | None = None
+
+class BatchGenerateNewWordEntryResponse(BaseModel): 
+    results: List[BatchGenerateNewWordEntryResponseBase]
+
 # --- register word ---
 class RegisterWordRequest(BaseModel): 
     spelling: str = Field(
@@ -82,3 +121,23 @@ class RegisterWordRequest(BaseModel):
 class DeleteWordRequest(BaseModel): 
     user_word_id: str
 
+# --- bulk register / delete ---
+class BulkRegisterWordsRequest(BaseModel): 
+    items: List[RegisterWordRequest] = Field(
+        min_length=1,
+        max_length=const.MAX_NUM_BULK_WORD_OPERATION,
+    )
+
+class BulkDeleteWordsRequest(BaseModel): 
+    user_word_ids: List[str] = Field(
+        min_length=1,
+        max_length=const.MAX_NUM_BULK_WORD_OPERATION,
+    )
+
+class BulkWordOperationResponseBase(BaseModel): 
+    index: int  # position in the request items (row number for CSV, header excluded)
+    status: Literal["registered", "already_registered", "deleted", "not_found", "duplicate", "invalid"]
+    user_word_id: str | None = None
+
+class BulkWordOperationResponse(BaseModel): 
+    results: List[BulkWordOperationResponseBase]
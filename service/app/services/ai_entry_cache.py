@@ -0,0 +1,133 @@
+"""
+Two-tier cache (in-process LRU + Mongo collection with TTL) for AI generated word entries.
+
+Admin purge (from service/app):
+
+    python -m services.ai_entry_cache --purge                 # purge every entry
+    python -m services.ai_entry_cache --purge --spelling word # purge entries of one spelling
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import timezone
+from typing import Tuple
+from pymongo.asynchronous.database import AsyncDatabase
+import core.config as config
+import core.const as const
+from repositories.ai_entry_cache_repository import AiEntryCacheRepository
+from schemas.word_schemas import GenerateNewWordEntryRequest, GenerateNewWordEntryResponse
+
+# changing AI_GENERATION_PROMPT invalidates every cached entry
+PROMPT_VERSION = hashlib.sha256((config.AI_GENERATION_PROMPT or "").encode()).hexdigest()[:12]
+
+def _normalize(v: str | None) -> str:
+    return " ".join((v or "").split())
+
+class AiEntryCache:
+    """LRU in front of AiEntryCacheRepository, keyed on normalized request fields and PROMPT_VERSION."""
+
+    def __init__(
+        self,
+        maxsize: int = const.AI_ENTRY_CACHE_LRU_SIZE,
+        ttl_seconds: int = const.AI_ENTRY_CACHE_TTL_SECONDS,
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[GenerateNewWordEntryResponse, float, str]]" = OrderedDict()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(payload: GenerateNewWordEntryRequest) -> Tuple[str, str, str, str]:
+        return (
+            _normalize(payload.spelling).lower(),
+            _normalize(payload.meaning),
+            _normalize(payload.example_sentence),
+            _normalize(payload.example_sentence_translation),
+        )
+
+    @classmethod
+    def make_key(cls, payload: GenerateNewWordEntryRequest) -> str:
+        raw = json.dumps([PROMPT_VERSION, *cls.normalize(payload)], ensure_ascii=False)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, db: AsyncDatabase, payload: GenerateNewWordEntryRequest) -> GenerateNewWordEntryResponse | None:
+        key = self.make_key(payload)
+
+        cached = self._entries.get(key)
+        if cached is not None:
+            entry, expires_at, _ = cached
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+            del self._entries[key]
+
+        doc = await AiEntryCacheRepository(db).find(key)
+        if doc is None:
+            self.misses += 1
+            return None
+
+        entry = GenerateNewWordEntryResponse.model_validate(doc["entry"])
+        created_at = doc["created_at"].replace(tzinfo=timezone.utc).timestamp()
+        self._remember(key, entry, created_at + self.ttl_seconds, self.normalize(payload)[0])
+        self.db_hits += 1
+        return entry
+
+    async def put(self, db: AsyncDatabase, payload: GenerateNewWordEntryRequest, entry: GenerateNewWordEntryResponse) -> None:
+        key = self.make_key(payload)
+        spelling = self.normalize(payload)[0]
+        self._remember(key, entry, time.time() + self.ttl_seconds, spelling)
+        await AiEntryCacheRepository(db).upsert(key, spelling, PROMPT_VERSION, entry.model_dump())
+
+    async def purge(self, db: AsyncDatabase, *, spelling: str | None = None) -> int:
+        """Delete cached entries (of one spelling if given) from both tiers; return the number deleted from DB."""
+        if spelling is None:
+            self._entries.clear()
+        else:
+            spelling = _normalize(spelling).lower()
+            for key in [k for k, (_, _, s) in self._entries.items() if s == spelling]:
+                del self._entries[key]
+        return await AiEntryCacheRepository(db).delete_all(spelling=spelling)
+
+    def _remember(self, key: str, entry: GenerateNewWordEntryResponse, expires_at: float, spelling: str) -> None:
+        self._entries[key] = (entry, expires_at, spelling)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Return a snapshot of cache metrics."""
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.db_hits) / lookups if lookups else 0.0,
+        }
+
+ai_entry_cache = AiEntryCache()
+
+async def _main(spelling: str | None) -> None:
+    from repositories.session import client, get_db
+
+    try:
+        deleted = await ai_entry_cache.purge(get_db(), spelling=spelling)
+    finally:
+        await client.close()
+    print(f"purged {deleted} cached entries")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the AI generated entry cache.")
+    parser.add_argument("--purge", action="store_true", help="delete cached entries")
+    parser.add_argument("--spelling", help="only purge entries of this spelling")
+    args = parser.parse_args()
+    if not args.purge:
+        parser.error("nothing to do (use --purge)")
+    asyncio.run(_main(args.spelling))
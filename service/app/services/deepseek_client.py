@@ -0,0 +1,285 @@
+import asyncio
+import json
+import random
+import time
+from typing import AsyncIterator
+import httpx
+import core.config as config
+import core.const as const
+from core.errors import ServiceError, TooManyRequestsError, UpstreamUnavailableError
+from core.metrics import DEEPSEEK_CALL_DURATION
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    closed -> open after failure_threshold failures; open -> half-open after reset_seconds,
+    where a single trial call decides between closed and open again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = const.DEEPSEEK_CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = const.DEEPSEEK_CIRCUIT_RESET_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give up a half-open trial without an outcome (e.g. the caller went away)."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+class DeepSeekClient:
+    """
+    Shared async client for DeepSeek chat completions.
+    - keep-alive connection pool (one per process, created at startup)
+    - bounded retries with full-jitter exponential backoff on 429/5xx and transport errors
+      (except a pool timeout: the local pool is saturated, which says nothing about DeepSeek)
+    - circuit breaker that fails fast while DeepSeek is degraded
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        api_key: str | None = None,
+        timeout: float = const.DEEPSEEK_TIMEOUT_SECONDS,
+        max_retries: int = const.DEEPSEEK_MAX_RETRIES,
+        backoff_base: float = const.DEEPSEEK_BACKOFF_BASE_SECONDS,
+        backoff_max: float = const.DEEPSEEK_BACKOFF_MAX_SECONDS,
+        max_connections: int = const.DEEPSEEK_MAX_CONNECTIONS,
+    ):
+        key = (api_key or config.DEEPSEEK_API_KEY or "").strip()
+        url = (url or config.DEEPSEEK_URL or "").strip()
+        if not key:
+            raise RuntimeError("DeepSeek API key is missing")
+        if not url:
+            raise RuntimeError("DeepSeek API URL is missing")
+
+        self.url = url
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = CircuitBreaker()
+        self._client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+        # metrics
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.pool_exhausted = 0
+
+    async def post_chat(self, body: dict) -> dict:
+        """POST a chat completion request and return the decoded JSON body."""
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            resp_json = await self._post_chat(body)
+            outcome = "ok"
+            return resp_json
+        finally:
+            DEEPSEEK_CALL_DURATION.observe(time.perf_counter() - start, "chat", outcome)
+
+    async def _post_chat(self, body: dict) -> dict:
+        if not self.breaker.allow():
+            self.short_circuited += 1
+            raise UpstreamUnavailableError("DeepSeek API is unavailable (circuit open)")
+
+        error: Exception | None = None
+        settled = False
+        try:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.retries += 1
+                    await asyncio.sleep(self._backoff(attempt, error))
+
+                self.requests += 1
+                try:
+                    resp = await self._client.post(self.url, json=body)
+                except httpx.PoolTimeout:
+                    raise self._pool_exhausted()
+                except httpx.TransportError as e:
+                    error = e
+                    continue
+
+                if resp.status_code == 200:
+                    resp_json = resp.json()
+                    settled = True
+                    self.breaker.record_success()
+                    return resp_json
+
+                error = _StatusError(resp)
+                if resp.status_code not in RETRY_STATUS_CODES:
+                    # client-side error (bad key, bad request): DeepSeek itself is healthy
+                    settled = True
+                    self.breaker.record_success()
+                    raise ServiceError(f"DeepSeek API error: {resp.status_code} {resp.text[:200]}")
+
+            settled = True
+            raise self._exhausted(error)
+        finally:
+            if not settled:
+                self.breaker.release()
+
+    async def stream_chat(self, body: dict) -> AsyncIterator[str]:
+        """
+        POST a streaming chat completion request and yield content deltas as they arrive.
+        Retries only happen before the first delta; a failure after that raises immediately.
+        """
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            async for delta in self._stream_chat(body):
+                yield delta
+            outcome = "ok"
+        finally:
+            DEEPSEEK_CALL_DURATION.observe(time.perf_counter() - start, "stream", outcome)
+
+    async def _stream_chat(self, body: dict) -> AsyncIterator[str]:
+        if not self.breaker.allow():
+            self.short_circuited += 1
+            raise UpstreamUnavailableError("DeepSeek API is unavailable (circuit open)")
+
+        body = {**body, "stream": True}
+        error: Exception | None = None
+        started = False
+        settled = False
+        try:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.retries += 1
+                    await asyncio.sleep(self._backoff(attempt, error))
+
+                self.requests += 1
+                try:
+                    async with self._client.stream("POST", self.url, json=body) as resp:
+                        if resp.status_code != 200:
+                            await resp.aread()
+                            error = _StatusError(resp)
+                            if resp.status_code not in RETRY_STATUS_CODES:
+                                settled = True
+                                self.breaker.record_success()
+                                raise ServiceError(f"DeepSeek API error: {resp.status_code} {resp.text[:200]}")
+                            continue
+
+                        async for line in resp.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[len("data:"):].strip()
+                            if data == "[DONE]":
+                                break
+                            choices = json.loads(data).get("choices") or [{}]
+                            delta = (choices[0].get("delta") or {}).get("content")
+                            if delta:
+                                started = True
+                                yield delta
+
+                        settled = True
+                        self.breaker.record_success()
+                        return
+                except httpx.PoolTimeout:
+                    raise self._pool_exhausted()
+                except httpx.TransportError as e:
+                    error = e
+                    if started:
+                        break
+
+            settled = True
+            raise self._exhausted(error)
+        finally:
+            if not settled:
+                self.breaker.release()
+
+    def _exhausted(self, error: Exception | None) -> UpstreamUnavailableError:
+        """Record a failed call on the breaker and build the error to raise."""
+        self.failures += 1
+        self.breaker.record_failure()
+        if isinstance(error, _StatusError):
+            return UpstreamUnavailableError(f"DeepSeek API error: {error.response.status_code} {error.response.text[:200]}")
+        return UpstreamUnavailableError(f"Failed to call DeepSeek API: {error!r}")
+
+    def _pool_exhausted(self) -> TooManyRequestsError:
+        """
+        No pooled connection became free in time: this process is saturated, DeepSeek may be fine.
+        Not retried and not recorded on the breaker (a half-open trial is released by the caller).
+        """
+        self.pool_exhausted += 1
+        return TooManyRequestsError("Too many DeepSeek calls in progress")
+
+    def _backoff(self, attempt: int, error: Exception | None) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+        if isinstance(error, _StatusError):
+            retry_after = error.response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+        return delay
+
+    def stats(self) -> dict:
+        """Return a snapshot of client metrics."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "short_circuited": self.short_circuited,
+            "pool_exhausted": self.pool_exhausted,
+            "circuit_state": self.breaker.state,
+        }
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+class _StatusError(Exception):
+    def __init__(self, response: httpx.Response):
+        super().__init__(response.status_code)
+        self.response = response
+
+_deepseek_client: DeepSeekClient | None = None
+
+def get_deepseek_client() -> DeepSeekClient:
+    """Return the process-wide DeepSeekClient (created on first use if startup did not)."""
+    global _deepseek_client
+    if _deepseek_client is None:
+        _deepseek_client = DeepSeekClient()
+    return _deepseek_client
+
+async def close_deepseek_client() -> None:
+    global _deepseek_client
+    if _deepseek_client is not None:
+        await _deepseek_client.aclose()
+        _deepseek_client = None
@@ -0,0 +1,163 @@
+"""
+Import a dictionary file (spelling + meaning) into the 'words' collection.
+
+    python -m services.dictionary_import words.csv     # header "spelling,meaning" or two columns without header
+    python -m services.dictionary_import words.jsonl   # {"spelling": ..., "meaning": ...} per line
+
+Entries whose details already exist are left untouched; new ones get registration_count 0.
+"""
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+from pymongo.asynchronous.database import AsyncDatabase
+from core import const
+from models.word import WordDetails
+from repositories.word_repository import WordRepository
+
+def iter_csv_records(lines: Iterable[str], fields: Sequence[str]) -> Iterator[Dict[str, str | None]]:
+    """
+    Yield a dict of fields per CSV row (missing columns are None).
+    The first row is used as the header if it names fields[0], otherwise columns are taken in fields order.
+    """
+    reader = csv.reader(lines)
+    first = next(reader, None)
+    if first is None:
+        return
+
+    header = [h.strip().lower() for h in first]
+    if fields[0] in header:
+        positions = {f: header.index(f) for f in fields if f in header}
+    else:
+        positions = {f: i for i, f in enumerate(fields)}
+        reader = itertools.chain([first], reader)
+
+    for row in reader:
+        yield {f: row[positions[f]] if f in positions and positions[f] < len(row) else None for f in fields}
+
+def iter_csv(path: Path) -> Iterator[dict]:
+    with path.open(newline="", encoding="utf-8") as f:
+        yield from iter_csv_records(f, ("spelling", "meaning"))
+
+def iter_jsonl(path: Path) -> Iterator[dict]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError:
+                obj = None
+            yield obj if isinstance(obj, dict) else {}
+
+def to_word_details(raw: dict) -> WordDetails | None:
+    """Normalize like RegisterWordRequest (strip + lowercase spelling); None if the entry is invalid."""
+    spelling = raw.get("spelling")
+    meaning = raw.get("meaning")
+    if not isinstance(spelling, str) or not (meaning is None or isinstance(meaning, str)):
+        return None
+
+    spelling = spelling.strip().lower()
+    meaning = (meaning or "").strip() or None
+    if not const.SPELLING_MIN_LEN <= len(spelling) <= const.SPELLING_MAX_LEN:
+        return None
+    if meaning is not None and len(meaning) > const.MEANING_MAX_LEN:
+        return None
+    return WordDetails(spelling=spelling, meaning=meaning)
+
+async def import_dictionary(
+    db: AsyncDatabase,
+    entries: Iterable[dict],
+    *,
+    batch_size: int = const.DICTIONARY_IMPORT_BATCH_SIZE,
+    concurrency: int = const.DICTIONARY_IMPORT_CONCURRENCY,
+    on_progress: Callable[[Dict[str, int]], None] | None = None,
+) -> Dict[str, int]:
+    """
+    Stream entries into 'words' with unordered bulk upserts, keeping up to `concurrency` batches in flight
+    while the next batch is parsed. Duplicates within the input are dropped before they reach the DB.
+    """
+    repo = WordRepository(db)
+    stats = {"read": 0, "inserted": 0, "existing": 0, "duplicate": 0, "invalid": 0}
+    seen: Set[Tuple[str, str | None]] = set()
+    pending: Set[asyncio.Task] = set()
+
+    async def _write(batch: List[WordDetails]) -> None:
+        inserted, existing = await repo.bulk_upsert_details(batch)
+        stats["inserted"] += inserted
+        stats["existing"] += existing
+        if on_progress is not None:
+            on_progress(stats)
+
+    async def _flush(batch: List[WordDetails]) -> None:
+        nonlocal pending
+        while len(pending) >= concurrency:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                t.result()
+        pending.add(asyncio.create_task(_write(batch)))
+
+    batch: List[WordDetails] = []
+    try:
+        for raw in entries:
+            stats["read"] += 1
+            details = to_word_details(raw)
+            if details is None:
+                stats["invalid"] += 1
+                continue
+            key = (details.spelling, details.meaning)
+            if key in seen:
+                stats["duplicate"] += 1
+                continue
+            seen.add(key)
+
+            batch.append(details)
+            if len(batch) >= batch_size:
+                await _flush(batch)
+                batch = []
+        if batch:
+            await _flush(batch)
+        if pending:
+            await asyncio.gather(*pending)
+    finally:
+        for t in pending:
+            t.cancel()
+    return stats
+
+async def _main(path: Path, fmt: str, batch_size: int, concurrency: int) -> None:
+    from repositories.session import client, get_db
+
+    entries = iter_jsonl(path) if fmt == "jsonl" else iter_csv(path)
+    start = time.monotonic()
+    last_report = 0.0
+
+    def _report(stats: Dict[str, int]) -> None:
+        nonlocal last_report
+        now = time.monotonic()
+        if now - last_report >= 1.0:
+            last_report = now
+            print(f"read {stats['read']} inserted {stats['inserted']} ({stats['read'] / (now - start):.0f} docs/s)", file=sys.stderr)
+
+    try:
+        stats = await import_dictionary(get_db(), entries, batch_size=batch_size, concurrency=concurrency, on_progress=_report)
+    finally:
+        await client.close()
+
+    elapsed = time.monotonic() - start
+    print(json.dumps({**stats, "seconds": round(elapsed, 2)}))
+    print("restart the service to reload the suggest index", file=sys.stderr)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a dictionary file into the words collection.")
+    parser.add_argument("path", type=Path, help="CSV or JSONL file of spelling + meaning")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=const.DICTIONARY_IMPORT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=const.DICTIONARY_IMPORT_CONCURRENCY, help="bulk writes in flight")
+    args = parser.parse_args()
+    fmt = args.format or ("jsonl" if args.path.suffix.lower() in (".jsonl", ".ndjson") else "csv")
+    asyncio.run(_main(args.path, fmt, args.batch_size, args.concurrency))
@@ -1,15 +1,32 @@
+import asyncio
+import json
+import logging
 import re
-import requests
+from typing import AsyncIterator, Dict, List, Tuple
 import core.config as config
+import core.const as const
+
+from pymongo import errors as mongo_errors
+from pymongo.asynchronous.database import AsyncDatabase
+from core.errors import AppError, ServiceError, TooManyRequestsError
+from core.single_flight import SingleFlight
+from services.ai_entry_cache import ai_entry_cache
+from services.deepseek_client import DeepSeekClient, get_deepseek_client
+from schemas.word_schemas import (
+    BatchGenerateNewWordEntryRequest, BatchGenerateNewWordEntryResponse, BatchGenerateNewWordEntryResponseBase,
+    GenerateNewWordEntryRequest, GenerateNewWordEntryResponse,
+)
 
-from requests import RequestException
-from core.errors import ServiceError
-from schemas.word_schemas import GenerateNewWordEntryRequest, GenerateNewWordEntryResponse
-
-DEEPSEEK_API_KEY = config.DEEPSEEK_API_KEY
-DEEPSEEK_URL = config.DEEPSEEK_URL or ""
 AI_GENERATION_PROMPT = config.AI_GENERATION_PROMPT
 
+logger = logging.getLogger(__name__)
+
+# identical concurrent generation requests share one upstream call
+generation_flight = SingleFlight()
+
+# DeepSeek calls in flight for batch generation, across all batch requests of this process
+batch_generation_semaphore = asyncio.Semaphore(const.BATCH_GENERATE_CONCURRENCY)
+
 LABEL_RX = {
     "spelling": re.compile(r"^\s*\**\s*スペル\s*\**\s*[:：\-]?\s*(.*)\s*$"),
     "meaning": re.compile(r"^\s*\**\s*意味\s*\**\s*[:：\-]?\s*(.*)\s*$"),
@@ -17,53 +34,184 @@ LABEL_RX = {
     "ja": re.compile(r"^\s*\**\s*和訳\s*\**\s*[:：\-]?\s*(.*)\s*$"),
 }
 
+# LABEL_RX key -> GenerateNewWordEntryResponse field
+LABEL_FIELDS = {
+    "spelling": "spelling",
+    "meaning": "meaning",
+    "en": "example_sentence",
+    "ja": "example_sentence_translation",
+}
+
+def parse_label_line(line: str) -> Tuple[str, str] | None:
+    """Return (response field, value) if line is one of the labeled lines, else None."""
+    s = line.strip()
+    if not s:
+        return None
+    for label, rx in LABEL_RX.items():
+        m = rx.match(s)
+        if m:
+            return LABEL_FIELDS[label], m.group(1).strip()
+    return None
+
+def build_word_entry(fields: Dict[str, str]) -> GenerateNewWordEntryResponse:
+    """Build the response from parsed fields; every field is required."""
+    if not all(fields.get(f) for f in LABEL_FIELDS.values()):
+        raise ServiceError("DS response missing required fields")
+    return GenerateNewWordEntryResponse(**{f: fields[f] for f in LABEL_FIELDS.values()})
+
+class WordEntryStreamParser:
+    """
+    Incremental version of the LABEL_RX parsing for streamed completions.
+    feed() returns the fields whose line has been completed by the chunk.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, str] = {}
+        self._buf = ""
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        self._buf += chunk
+        *lines, self._buf = self._buf.split("\n")
+        return self._parse(lines)
+
+    def close(self) -> List[Tuple[str, str]]:
+        """Parse the last (unterminated) line."""
+        lines, self._buf = [self._buf], ""
+        return self._parse(lines)
+
+    def _parse(self, lines: List[str]) -> List[Tuple[str, str]]:
+        parsed = []
+        for line in lines:
+            field = parse_label_line(line)
+            if field is not None:
+                self.fields[field[0]] = field[1]
+                parsed.append(field)
+        return parsed
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 class GenerativeAIService: 
-    def __init__(self, api_key: str | None = None, timeout: int = 30):
-        key = (api_key or DEEPSEEK_API_KEY or "").strip()
-        url = (DEEPSEEK_URL or "").strip()
-        if not key:
-            raise RuntimeError("DeepSeek API key is missing")
-        if not url:
-            raise RuntimeError("DeepSeek API URL is missing")
-
-        self.api_key = key
-        self.url = url
-        self.timeout = timeout
-
-    def generate_word_entry(self, payload: GenerateNewWordEntryRequest) -> GenerateNewWordEntryResponse:
+    def __init__(self, db: AsyncDatabase, client: DeepSeekClient | None = None):
+        self.db = db
+        self.client = client or get_deepseek_client()
+
+    async def generate_word_entry(self, payload: GenerateNewWordEntryRequest) -> GenerateNewWordEntryResponse:
         """
         Return WordEntryModel that is generated by AI api.
+        The result is cached (see services/ai_entry_cache.py); a cache failure never fails the generation.
+        Concurrent requests with the same normalized payload are coalesced into one generation.
         """
+        return await generation_flight.do(
+            ai_entry_cache.make_key(payload), 
+            lambda: self.__generate_word_entry(payload),
+        )
 
+    async def generate_word_entries(self, payload: BatchGenerateNewWordEntryRequest) -> BatchGenerateNewWordEntryResponse:
+        """
+        Generate every item with at most BATCH_GENERATE_CONCURRENCY DeepSeek calls in flight (per process).
+        Each item goes through generate_word_entry (cache / coalescing), and a failed item
+        is reported in its result instead of failing the whole batch.
+        """
+        async def _generate(index: int, item: GenerateNewWordEntryRequest) -> BatchGenerateNewWordEntryResponseBase:
+            async with batch_generation_semaphore: 
+                try: 
+                    entry = await self.generate_word_entry(item)
+                    return BatchGenerateNewWordEntryResponseBase(index=index, entry=entry)
+                except AppError as e: 
+                    return BatchGenerateNewWordEntryResponseBase(index=index, error=str(e) or e.__class__.__name__)
+
+        results = await asyncio.gather(*(_generate(i, item) for i, item in enumerate(payload.items)))
+        return BatchGenerateNewWordEntryResponse(results=list(results))
+
+    async def __generate_word_entry(self, payload: GenerateNewWordEntryRequest) -> GenerateNewWordEntryResponse:
         try: 
-            # get prompt setting 
-            if AI_GENERATION_PROMPT is None: 
-                raise ServiceError("failed to get AI_GENERATION_PROMPT")
-
-            prompt = AI_GENERATION_PROMPT.format(
-                spelling=payload.spelling, 
-                meaning=payload.meaning, 
-                example_sentence=payload.example_sentence, 
-                example_sentence_translation=payload.example_sentence_translation,
-            )
-
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-            deepseek_payload = {
-                "model": "deepseek-chat",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.7,
-            }
-
-            # post prompt
-            resp = requests.post(DEEPSEEK_URL, headers=headers, json=deepseek_payload, timeout=self.timeout)
-            if resp.status_code != 200:
-                raise ServiceError(f"DeepSeek API error: {resp.status_code} {resp.text[:200]}")
+            cached = await ai_entry_cache.get(self.db, payload)
+            if cached is not None: 
+                return cached
+        except mongo_errors.PyMongoError as e: 
+            logger.warning("failed to read AI entry cache: %s", e)
+
+        entry = await self.__request_word_entry(payload)
+
+        try: 
+            await ai_entry_cache.put(self.db, payload, entry)
+        except mongo_errors.PyMongoError as e: 
+            logger.warning("failed to write AI entry cache: %s", e)
+        return entry
+
+    async def stream_word_entry(self, payload: GenerateNewWordEntryRequest) -> AsyncIterator[str]:
+        """
+        Yield Server-Sent Events for the generation of payload:
+        - `field` {"field": ..., "value": ...} as soon as each labeled line is complete
+        - `done` with the whole entry, or `error` {"detail": ...}
+        Cached entries are replayed immediately; a completed stream is stored in the cache.
+        """
+        try: 
+            try: 
+                cached = await ai_entry_cache.get(self.db, payload)
+            except mongo_errors.PyMongoError as e: 
+                logger.warning("failed to read AI entry cache: %s", e)
+                cached = None
+
+            if cached is not None: 
+                for field, value in cached.model_dump().items(): 
+                    yield _sse("field", {"field": field, "value": value})
+                yield _sse("done", cached.model_dump())
+                return
+
+            parser = WordEntryStreamParser()
+            async for chunk in self.client.stream_chat(self.__build_chat_body(payload)): 
+                for field, value in parser.feed(chunk): 
+                    yield _sse("field", {"field": field, "value": value})
+            for field, value in parser.close(): 
+                yield _sse("field", {"field": field, "value": value})
+
+            entry = build_word_entry(parser.fields)
+            yield _sse("done", entry.model_dump())
+
+            try: 
+                await ai_entry_cache.put(self.db, payload, entry)
+            except mongo_errors.PyMongoError as e: 
+                logger.warning("failed to write AI entry cache: %s", e)
+
+        except AppError as e: 
+            yield _sse("error", {"detail": str(e) or e.__class__.__name__})
+        except Exception as e: 
+            logger.exception("failed to stream word entry")
+            yield _sse("error", {"detail": f"DeepSeek API error: {e}"})
+
+    def __build_chat_body(self, payload: GenerateNewWordEntryRequest) -> dict: 
+        # get prompt setting 
+        if AI_GENERATION_PROMPT is None: 
+            raise ServiceError("failed to get AI_GENERATION_PROMPT")
+
+        prompt = AI_GENERATION_PROMPT.format(
+            spelling=payload.spelling, 
+            meaning=payload.meaning, 
+            example_sentence=payload.example_sentence, 
+            example_sentence_translation=payload.example_sentence_translation,
+        )
+
+        return {
+            "model": "deepseek-chat",
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.7,
+        }
+
+    async def __request_word_entry(self, payload: GenerateNewWordEntryRequest) -> GenerateNewWordEntryResponse:
+        """
+        Call DeepSeek API and parse the generated entry.
+        """
+
+        try: 
+            deepseek_payload = self.__build_chat_body(payload)
+
+            # post prompt (retries / circuit breaker are handled by the client)
+            resp_json = await self.client.post_chat(deepseek_payload)
 
             # get contents
-            choices = resp.json().get("choices") or []
+            choices = resp_json.get("choices") or []
             content = ""
             if choices: 
                 msg = choices[0].get("message") or {}
@@ -71,42 +219,18 @@ class GenerativeAIService:
             if not content:
                 raise ServiceError("DeepSeek returned empty content")
 
-            print(content)
+            logger.debug("DeepSeek content: %s", content)
 
             # extract each components
-            spelling = meaning = example_sentence = example_sentence_translation = ""
+            fields: Dict[str, str] = {}
             for raw_line in content.splitlines():
-                s = raw_line.strip()
-                if not s:
-                    continue
-                m = LABEL_RX["spelling"].match(s)
-                if m:
-                    spelling = m.group(1).strip()
-                    continue
-                m = LABEL_RX["meaning"].match(s)
-                if m:
-                    meaning = m.group(1).strip()
-                    continue
-                m = LABEL_RX["en"].match(s)
-                if m:
-                    example_sentence = m.group(1).strip()
-                    continue
-                m = LABEL_RX["ja"].match(s)
-                if m:
-                    example_sentence_translation = m.group(1).strip()
-                    continue
-
-            if not (spelling and meaning and example_sentence and example_sentence_translation):
-                raise ServiceError("DS response missing required fields")
-
-            return GenerateNewWordEntryResponse(
-                spelling=spelling, 
-                meaning=meaning,
-                example_sentence=example_sentence, 
-                example_sentence_translation=example_sentence_translation
-            )
-        except RequestException as e: 
-            raise ServiceError("Failed to call DeepSeek API") from e
+                parsed = parse_label_line(raw_line)
+                if parsed is not None: 
+                    fields[parsed[0]] = parsed[1]
+
+            return build_word_entry(fields)
+        except (ServiceError, TooManyRequestsError): 
+            raise
         except Exception as e:
             raise ServiceError(f"DeepSeek API error: {e}")
 
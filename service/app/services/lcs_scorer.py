@@ -0,0 +1,39 @@
+from typing import Dict, Iterable, List
+
+class LcsScorer:
+    """
+    Bit-parallel LCS scorer (Allison-Dix / Hyyro) for a fixed query.
+    Per-char position masks of the query are built once and reused for every candidate,
+    so each candidate costs O(len(candidate)) big-int ops instead of an O(n*m) DP table.
+    """
+
+    def __init__(self, query: str):
+        self.query = query
+        self.n = len(query)
+        self._full = (1 << self.n) - 1
+
+        masks: Dict[str, int] = {}
+        for i, ch in enumerate(query):
+            masks[ch] = masks.get(ch, 0) | (1 << i)
+        self._masks = masks
+
+    def lcs_len(self, candidate: str) -> int:
+        """Return LCS length of query and candidate."""
+        full = self._full
+        masks = self._masks
+        v = full
+        for ch in candidate:
+            u = v & masks.get(ch, 0)
+            v = ((v + u) | (v - u)) & full
+        return self.n - v.bit_count()
+
+    def score(self, candidate: str) -> float:
+        """Normalize LCS length by max length to get [0,1]."""
+        if not self.query or not candidate:
+            return 0.0
+        return self.lcs_len(candidate) / max(self.n, len(candidate))
+
+    def score_all(self, candidates: Iterable[str]) -> List[float]:
+        """Score every candidate against the query."""
+        score = self.score
+        return [score(c) for c in candidates]
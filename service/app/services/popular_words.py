@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import time
+from bson import ObjectId
+from pymongo import errors as mongo_errors
+from pymongo.asynchronous.database import AsyncDatabase
+import core.const as const
+from repositories.popular_word_repository import PopularWordRepository
+
+logger = logging.getLogger(__name__)
+
+class PopularWordsRefresher:
+    """
+    Background task rebuilding the materialized popular words collection every `interval` seconds,
+    so readers (popular words endpoint, suggestions for empty input) never sort 'words' themselves.
+    Each worker/replica runs one, but only the holder of the refresh lease (held for two intervals and
+    renewed on every round) rebuilds the collection; the others skip their round.
+    """
+
+    def __init__(self, interval: float = const.POPULAR_WORDS_REFRESH_SECONDS, size: int = const.POPULAR_WORDS_SIZE):
+        self.interval = interval
+        self.size = size
+        self._task: asyncio.Task | None = None
+        self._owner = str(ObjectId())
+        self.refreshes = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_count = 0
+        self.last_duration = 0.0
+
+    async def refresh_once(self, db: AsyncDatabase) -> int | None:
+        """Rebuild the collection if this process holds the refresh lease; None if another one does."""
+        repo = PopularWordRepository(db)
+        if not await repo.acquire_refresh_lease(self._owner, 2 * self.interval):
+            self.skipped += 1
+            return None
+        start = time.perf_counter()
+        count = await repo.refresh(self.size)
+        self.last_duration = time.perf_counter() - start
+        self.last_count = count
+        self.refreshes += 1
+        return count
+
+    async def _run(self, db: AsyncDatabase) -> None:
+        while True:
+            try:
+                await self.refresh_once(db)
+            except mongo_errors.PyMongoError as e:
+                self.failures += 1
+                logger.warning("failed to refresh popular words: %s", e)
+            except Exception:
+                # keep the loop alive: one bad round must not leave the collection stale for good
+                # (CancelledError is not an Exception, so stop() still ends the loop)
+                self.failures += 1
+                logger.exception("failed to refresh popular words")
+            await asyncio.sleep(self.interval)
+
+    def start(self, db: AsyncDatabase) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(db))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        """Return a snapshot of refresher metrics."""
+        return {
+            "refreshes": self.refreshes,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "last_count": self.last_count,
+            "last_duration_seconds": self.last_duration,
+        }
+
+popular_words_refresher = PopularWordsRefresher()
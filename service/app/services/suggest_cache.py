@@ -0,0 +1,68 @@
+from collections import OrderedDict
+from typing import Generic, Tuple, TypeVar
+import core.const as const
+from schemas.word_schemas import SuggestWordsResponse
+from services.suggest_index import SuggestIndex, suggest_index
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+class _Lru(Generic[K, V]):
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SuggestCache:
+    """
+    Bounded LRU of suggestion responses keyed by (lowercased input_str, max_num),
+    valid while nothing in the index changed (index.version).
+    """
+
+    def __init__(self, index: SuggestIndex, maxsize: int = const.SUGGEST_CACHE_SIZE):
+        self.index = index
+        self._results: _Lru[Tuple[str, int], Tuple[int, SuggestWordsResponse]] = _Lru(maxsize)
+        self.result_hits = 0
+        self.misses = 0
+
+    # --- results ---
+    def get_result(self, query: str, max_num: int) -> SuggestWordsResponse | None:
+        entry = self._results.get((query.lower(), max_num))
+        if entry is None or entry[0] != self.index.version:
+            self.misses += 1
+            return None
+        self.result_hits += 1
+        return entry[1]
+
+    def put_result(self, query: str, max_num: int, response: SuggestWordsResponse) -> None:
+        self._results.put((query.lower(), max_num), (self.index.version, response))
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    def stats(self) -> dict:
+        """Return a snapshot of cache metrics."""
+        return {
+            "results": len(self._results),
+            "result_hits": self.result_hits,
+            "misses": self.misses,
+        }
+
+suggest_cache = SuggestCache(suggest_index)
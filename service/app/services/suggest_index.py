@@ -0,0 +1,222 @@
+import logging
+import re
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Set, Tuple
+from core.oid import PyObjectId
+from models.word import WordRecord
+
+logger = logging.getLogger(__name__)
+
+# bit positions set in each byte value, and a C-speed scan for the non-zero bytes of a bitset
+_BYTE_BITS = [tuple(i for i in range(8) if b >> i & 1) for b in range(256)]
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+
+def _is_subsequence(query: str, spelling: str) -> bool:
+    """Return True if every char of query appears in spelling in order."""
+    it = iter(spelling)
+    return all(ch in it for ch in query)
+
+def suggestion_rank_key(scored: Tuple[float, WordRecord]) -> tuple:
+    """Sort key of a (score, word) pair: higher score, more registrations, shorter spelling, then alphabetical."""
+    score, word = scored
+    return (-score, -word.registration_count, len(word.spelling), word.spelling)
+
+def _same_score_rank_key(word: WordRecord) -> tuple:
+    """suggestion_rank_key among words of equal score."""
+    return (-word.registration_count, len(word.spelling), word.spelling)
+
+def _posting_keys(spelling: str) -> Set[str]:
+    """Every char of spelling, and every ordered pair of chars (x before y) as a two-char key."""
+    keys = set(spelling)
+    for i, ch in enumerate(spelling):
+        for other in spelling[i + 1:]:
+            keys.add(ch + other)
+    return keys
+
+def _bits_from_slots(slots: Iterable[int]) -> int:
+    slots = list(slots)
+    buf = bytearray(max(slots) // 8 + 1)
+    for s in slots:
+        buf[s >> 3] |= 1 << (s & 7)
+    return int.from_bytes(buf, "little")
+
+def _iter_bits(bits: int) -> Iterator[int]:
+    """Yield the positions of the set bits in ascending order."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for m in _NONZERO_BYTE.finditer(data):
+        base = m.start() * 8
+        for i in _BYTE_BITS[data[m.start()]]:
+            yield base + i
+
+class SuggestIndex:
+    """
+    In-process index of the 'words' collection for word suggestion.
+    Each word owns a slot. For every (lowercased) char and every ordered char pair of its spelling the slots
+    are kept as a bitset (a Python int), so a query is a handful of big-int ANDs: its chars (one char query)
+    or its consecutive char pairs. That is exact up to two chars and leaves few false positives (checked with
+    _is_subsequence) for longer queries.
+    Every subsequence match scores len(query) / len(spelling), so the ranking of suggestion_rank_key is by
+    length first. load() hands out slots in spelling length order, so top() decodes the matches shortest
+    first and stops after the length that completes max_num: a short query never decodes, scores or sorts
+    the thousands of longer words it matches. Words added after load() get slots after the ordered ones
+    (the tail) and are always decoded; the next load() puts them in order.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        # changes whenever a result of top() may change
+        self.version = 0
+        self._records: List[WordRecord | None] = []
+        self._spellings: List[str] = []
+        self._slots: Dict[PyObjectId, int] = {}
+        self._postings: Dict[str, int] = {}
+        # slots below _ordered are sorted by spelling length
+        self._ordered = 0
+        self._ordered_mask = 0
+
+    async def load(self, words: AsyncIterator[WordRecord]) -> None:
+        """(Re)build the index from every word item."""
+        self.clear()
+        unique: Dict[PyObjectId, WordRecord] = {}
+        async for word in words:
+            unique.setdefault(word.id, word)
+        ordered = sorted(unique.values(), key=lambda w: len(w.spelling.lower()))
+
+        slots_by_key: Dict[str, List[int]] = defaultdict(list)
+        for slot, word in enumerate(ordered):
+            spelling = word.spelling.lower()
+            self._records.append(word)
+            self._spellings.append(spelling)
+            self._slots[word.id] = slot
+            for key in _posting_keys(spelling):
+                slots_by_key[key].append(slot)
+        self._postings = {key: _bits_from_slots(slots) for key, slots in slots_by_key.items()}
+        self._ordered = len(ordered)
+        self._ordered_mask = (1 << self._ordered) - 1
+        self.loaded = True
+        logger.info("suggest index loaded: %d words", len(self._slots))
+
+    def clear(self) -> None:
+        self.loaded = False
+        self.version += 1
+        self._records = []
+        self._spellings = []
+        self._slots.clear()
+        self._postings.clear()
+        self._ordered = 0
+        self._ordered_mask = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # --- update ---
+    def add(self, word: WordRecord) -> None:
+        """Add (or replace) a word item."""
+        spelling = word.spelling.lower()
+        self.version += 1
+        slot = self._slots.get(word.id)
+        if slot is not None:
+            if self._spellings[slot] == spelling:
+                self._records[slot] = word
+                return
+            self.remove(word.id)
+
+        slot = len(self._records)
+        self._records.append(word)
+        self._spellings.append(spelling)
+        self._slots[word.id] = slot
+        bit = 1 << slot
+        for key in _posting_keys(spelling):
+            self._postings[key] = self._postings.get(key, 0) | bit
+
+    def add_registration_count(self, word_id: PyObjectId, delta: int) -> None:
+        """Adjust registration_count of an indexed word item (ignored if it is not indexed)."""
+        slot = self._slots.get(word_id)
+        if slot is not None:
+            word = self._records[slot]
+            self._records[slot] = word._replace(registration_count=max(0, word.registration_count + delta))
+            self.version += 1
+
+    def remove(self, word_id: PyObjectId) -> None:
+        """Remove a word item; its slot stays empty until the next load()."""
+        slot = self._slots.pop(word_id, None)
+        if slot is None:
+            return
+        self.version += 1
+        spelling = self._spellings[slot]
+        self._records[slot] = None
+        self._spellings[slot] = ""
+
+        mask = ~(1 << slot)
+        for key in _posting_keys(spelling):
+            bits = self._postings.get(key, 0) & mask
+            if bits:
+                self._postings[key] = bits
+            else:
+                self._postings.pop(key, None)
+
+    # --- read ---
+    def get(self, word_id: PyObjectId) -> WordRecord | None:
+        slot = self._slots.get(word_id)
+        return self._records[slot] if slot is not None else None
+
+    def top(self, query: str, limit: int) -> List[WordRecord]:
+        """
+        Return the best `limit` words whose spelling contains query as a case-insensitive subsequence,
+        in the order of suggestion_rank_key (same result as scoring every match with LcsScorer and ranking it).
+        """
+        q = query.lower()
+        if not q or limit <= 0:
+            return []
+        bits = self._match_bits(q)
+        if not bits:
+            return []
+
+        verify = len(q) > 2
+        records, spellings = self._records, self._spellings
+        found: List[Tuple[int, WordRecord]] = []
+
+        # ordered slots: shortest first, up to the length of the limit-th match
+        stop_length = None
+        for s in _iter_bits(bits & self._ordered_mask):
+            spelling = spellings[s]
+            if stop_length is not None and len(spelling) > stop_length:
+                break
+            if verify and not _is_subsequence(q, spelling):
+                continue
+            found.append((len(spelling), records[s]))
+            if stop_length is None and len(found) >= limit:
+                stop_length = len(spelling)
+
+        # words added since load()
+        ordered = self._ordered
+        for s in _iter_bits(bits >> ordered):
+            spelling = spellings[ordered + s]
+            if stop_length is not None and len(spelling) > stop_length:
+                continue
+            if verify and not _is_subsequence(q, spelling):
+                continue
+            found.append((len(spelling), records[ordered + s]))
+
+        found.sort(key=lambda item: (item[0], *_same_score_rank_key(item[1])))
+        return [word for _, word in found[:limit]]
+
+    def _match_bits(self, q: str) -> int:
+        """Slots that may contain q as a subsequence (exactly those, for len(q) <= 2)."""
+        if len(q) == 1:
+            return self._postings.get(q, 0)
+        postings = []
+        for key in {q[i:i + 2] for i in range(len(q) - 1)}:
+            bits = self._postings.get(key)
+            if bits is None:
+                return 0
+            postings.append(bits)
+        postings.sort(key=int.bit_length)
+        bits = postings[0]
+        for other in postings[1:]:
+            bits &= other
+            if not bits:
+                break
+        return bits
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,68 @@
+import csv
+import html
+import io
+from typing import AsyncIterator, Dict, Tuple
+from schemas.word_schemas import ExportFormat, ExportWordItem
+
+EXPORT_FIELDS = tuple(ExportWordItem.model_fields)
+
+# format -> (media type, file extension)
+EXPORT_MEDIA_TYPES: Dict[str, Tuple[str, str]] = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "anki": ("text/tab-separated-values; charset=utf-8", "txt"),
+}
+
+class WordExportWriter:
+    """
+    Serialize export items one by one.
+    - csv: header + one row per item (same columns as /word/register_words_csv)
+    - jsonl: one JSON object per line
+    - anki: Anki plain text import (tab separated, HTML); front = spelling, back = meaning + usage example
+    """
+
+    def __init__(self, fmt: ExportFormat):
+        self.fmt = fmt
+        self._buf = io.StringIO()
+        self._csv = csv.writer(self._buf, lineterminator="\n")
+
+    def header(self) -> str:
+        if self.fmt == "csv":
+            return self._csv_row(EXPORT_FIELDS)
+        if self.fmt == "anki":
+            return "#separator:tab\n#html:true\n#columns:Front\tBack\n"
+        return ""
+
+    def row(self, item: ExportWordItem) -> str:
+        if self.fmt == "jsonl":
+            return item.model_dump_json() + "\n"
+        if self.fmt == "csv":
+            return self._csv_row(tuple(getattr(item, f) or "" for f in EXPORT_FIELDS))
+
+        back = [v for v in (item.meaning, item.example_sentence, item.example_sentence_translation) if v]
+        return f"{self._anki_field(item.spelling)}\t{'<br>'.join(self._anki_field(v) for v in back)}\n"
+
+    def _csv_row(self, values: tuple) -> str:
+        self._buf.seek(0)
+        self._buf.truncate()
+        self._csv.writerow(values)
+        return self._buf.getvalue()
+
+    @staticmethod
+    def _anki_field(value: str) -> str:
+        # tabs / newlines would break the row
+        return html.escape(" ".join(value.split()))
+
+async def chunked(lines: AsyncIterator[str], chunk_size: int) -> AsyncIterator[bytes]:
+    """Join lines into chunks of about chunk_size bytes so each response write is not a single row."""
+    parts = []
+    size = 0
+    async for line in lines:
+        data = line.encode()
+        parts.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            yield b"".join(parts)
+            parts, size = [], 0
+    if parts:
+        yield b"".join(parts)
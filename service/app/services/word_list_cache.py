@@ -0,0 +1,72 @@
+import hashlib
+from collections import OrderedDict
+from typing import Tuple
+import core.const as const
+from core.oid import PyObjectId
+
+# (user_id, version, limit, after)
+CacheKey = Tuple[PyObjectId, int, int | None, str | None]
+
+class WordListCache:
+    """
+    Bounded LRU of rendered get_user_word_list bodies keyed by (user_id, version, page), and their ETags.
+    The version is the user's word_list_version in the users collection, which every register/delete
+    increments in the same write path, so it is shared by all workers: a cached body or an ETag of an
+    older version is never served after a change made by any of them.
+    The ETag also carries a hash of the page so that an ETag of one page never matches another.
+    """
+
+    def __init__(self, maxsize: int = const.WORD_LIST_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._bodies: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    # --- etag ---
+    def etag(self, key: CacheKey) -> str:
+        page = hashlib.blake2s(repr(key).encode(), digest_size=8).hexdigest()
+        return f'W/"{key[1]}.{page}"'
+
+    def is_not_modified(self, key: CacheKey, if_none_match: str | None) -> bool:
+        """True if If-None-Match contains the ETag of the page at key (weak comparison)."""
+        if not if_none_match:
+            return False
+        current = self.etag(key).removeprefix("W/")
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == current:
+                self.not_modified += 1
+                return True
+        return False
+
+    # --- bodies ---
+    def get(self, key: CacheKey) -> bytes | None:
+        body = self._bodies.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._bodies.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key: CacheKey, body: bytes) -> None:
+        self._bodies[key] = body
+        self._bodies.move_to_end(key)
+        if len(self._bodies) > self.maxsize:
+            self._bodies.popitem(last=False)
+
+    def clear(self) -> None:
+        self._bodies.clear()
+
+    def stats(self) -> dict:
+        """Return a snapshot of cache metrics."""
+        return {
+            "size": len(self._bodies),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+word_list_cache = WordListCache()
@@ -1,69 +1,165 @@
+import heapq
 import re
-from typing import List, Tuple 
-from pymongo.database import Database
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Set, Tuple 
+from bson import ObjectId
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo import errors as mongo_errors
 from pydantic import ValidationError
+from pydantic_core import to_json
 from core import const
 from models.user_word import UsageExample, UserWordModel
-from models.word import WordDetails, WordModel 
+from models.word import WordDetails, WordModel, WordRecord
 from repositories.word_repository import WordRepository
 from repositories.user_word_repository import UserWordRepository
+from repositories.user_repository import UserRepository
+from repositories.popular_word_repository import PopularWordRepository
+from repositories.session import run_in_transaction
+from services.suggest_index import suggest_index, suggestion_rank_key
+from services.suggest_cache import suggest_cache
+from services.lcs_scorer import LcsScorer
+from services.dictionary_import import iter_csv_records
+from services.word_export import WordExportWriter, chunked
+from services.word_list_cache import CacheKey, word_list_cache
 from core.oid import PyObjectId
 import core.config as config
 from core.errors import ServiceError, BadRequestError, ConflictError
-from schemas.word_schemas import DeleteWordRequest, GetWordContentRequest, GetWordListResponse, GetWordListResponseBase, GetWordContentResponse, RegisterWordRequest, SuggestWordsRequest, SuggestWordsResponse, SuggestWordsResponseBase
+from core.metrics import SUGGEST_STAGE_DURATION
+from schemas.word_schemas import PopularWordsResponse, PopularWordsResponseBase, ExportFormat, ExportWordItem, BulkDeleteWordsRequest, BulkRegisterWordsRequest, BulkWordOperationResponse, BulkWordOperationResponseBase, DeleteWordRequest, GetWordContentRequest, GetWordListResponse, GetWordListResponseBase, GetWordContentResponse, RegisterWordRequest, SuggestWordsRequest, SuggestWordsResponse, SuggestWordsResponseBase
 
 DEEPSEEK_API_KEY = config.DEEPSEEK_API_KEY
 MAX_NUM_WORD_SUGGEST = const.MAX_NUM_WORD_SUGGEST
 MAX_NUM_WORD_SUGGEST_CANDIDATE = const.MAX_NUM_WORD_SUGGEST_CANDIDATE
+BULK_REGISTER_CSV_FIELDS = ("spelling", "meaning", "example_sentence", "example_sentence_translation")
 
 
 class WordService:
     """Business logic for word operations including DeepSeek integration."""
-    def __init__(self, db: Database):
+    def __init__(self, db: AsyncDatabase):
+        self.db = db
         self.words = WordRepository(db)
         self.user_words = UserWordRepository(db)
+        self.users = UserRepository(db)
+        self.popular_words = PopularWordRepository(db)
 
     # --- get user word list --- 
-    def get_word_list_by_user_id(self, user_id: PyObjectId) -> GetWordListResponse: 
+    async def get_word_list_by_user_id(
+        self, 
+        user_id: PyObjectId,
+        *,
+        limit: int | None = None,
+        after: str | None = None,
+    ) -> GetWordListResponse: 
         """ 
         Return the word items linked to the given user. 
+        If limit is given, next_cursor is set when more items may follow.
         """
+        after_id = self.__parse_cursor(after)
         try: 
-            user_word_models = self.user_words.find_all(user_id=user_id)
-            word_ids = list(set(model.word_id for model in user_word_models))
-            word_models = self.words.find_all(word_ids = word_ids)
-            word_model_dict = {wm.id: wm for wm in word_models}
-
-            word_list: list[GetWordListResponseBase] = []
-            for m in user_word_models: 
-                word_model = word_model_dict.get(m.word_id, None)
-                if word_model is None: 
-                    raise ServiceError("failed to find word model")
+            docs = await self.user_words.find_word_list(user_id=user_id, limit=limit, after=after_id)
+            word_list = [self.__to_word_list_item(doc) for doc in docs]
 
-                item = GetWordListResponseBase(
-                    user_word_id=str(m.id),
-                    spelling=word_model.details.spelling, 
-                    meaning=word_model.details.meaning, 
-                )
-                word_list.append(item)
-            return GetWordListResponse(word_list=word_list) 
+            next_cursor = None
+            if limit is not None and len(word_list) == limit: 
+                next_cursor = word_list[-1].user_word_id
+            return GetWordListResponse(word_list=word_list, next_cursor=next_cursor) 
 
         except mongo_errors.PyMongoError as e:
             raise ServiceError(f"Database error: {e}")
         except Exception as e:
             raise ServiceError(f"service error: {e}")
 
+    async def get_word_list_cache_key(
+        self, 
+        user_id: PyObjectId,
+        *,
+        limit: int | None = None,
+        after: str | None = None,
+    ) -> CacheKey: 
+        """ key of the page at the user's current word_list_version (one indexed read of the user document) """
+        try: 
+            version = await self.users.get_word_list_version(user_id)
+            return (user_id, version, limit, after)
+        except mongo_errors.PyMongoError as e:
+            raise ServiceError(f"Database error: {e}")
+
+    async def get_word_list_json(self, key: CacheKey) -> bytes: 
+        """ 
+        Same as get_word_list_by_user_id but return the rendered JSON body of the page at key.
+        The body is served from word_list_cache while the user's list is unchanged.
+        """
+        body = word_list_cache.get(key)
+        if body is None: 
+            user_id, _, limit, after = key
+            body = to_json(await self.get_word_list_by_user_id(user_id, limit=limit, after=after))
+            word_list_cache.put(key, body)
+        return body
+
+    def stream_word_list_by_user_id(
+        self, 
+        user_id: PyObjectId,
+        *,
+        limit: int | None = None,
+        after: str | None = None,
+    ) -> AsyncIterator[bytes]: 
+        """ 
+        Return an iterator yielding the word items linked to the given user as NDJSON lines, straight from the DB cursor. 
+        The cursor is validated here so that a bad request fails before the response starts.
+        """
+        after_id = self.__parse_cursor(after)
+
+        async def _stream() -> AsyncIterator[bytes]: 
+            try: 
+                async for doc in self.user_words.iter_word_list(user_id=user_id, limit=limit, after=after_id): 
+                    yield self.__to_word_list_item(doc).model_dump_json().encode() + b"\n"
+
+            except mongo_errors.PyMongoError as e:
+                raise ServiceError(f"Database error: {e}")
+            except Exception as e:
+                raise ServiceError(f"service error: {e}")
+
+        return _stream()
+
+    # --- export ---
+    def stream_word_export(self, user_id: PyObjectId, fmt: ExportFormat) -> AsyncIterator[bytes]: 
+        """ 
+        Return an iterator yielding every word item of the user with its usage example in the given format,
+        straight from one joined DB cursor (constant memory).
+        """
+        writer = WordExportWriter(fmt)
+
+        async def _lines() -> AsyncIterator[str]: 
+            yield writer.header()
+            async for doc in self.user_words.iter_word_list(user_id=user_id, with_usage_example=True): 
+                # skip links whose word item does not exist
+                if doc.get("spelling") is None: 
+                    continue
+                doc.pop("user_word_id", None)
+                yield writer.row(ExportWordItem.model_construct(**doc))
+
+        async def _stream() -> AsyncIterator[bytes]: 
+            try: 
+                async for chunk in chunked(_lines(), const.WORD_EXPORT_CHUNK_BYTES): 
+                    yield chunk
+
+            except mongo_errors.PyMongoError as e:
+                raise ServiceError(f"Database error: {e}")
+            except Exception as e:
+                raise ServiceError(f"service error: {e}")
+
+        return _stream()
+
     # --- get word content --- 
-    def get_word_content(self, payload: GetWordContentRequest) -> GetWordContentResponse: 
+    async def get_word_content(self, payload: GetWordContentRequest) -> GetWordContentResponse: 
         try: 
             # find user_word model
-            user_word_model = self.user_words.find(user_word_id=PyObjectId(payload.user_word_id))
+            user_word_model = await self.user_words.find(user_word_id=PyObjectId(payload.user_word_id))
             if user_word_model is None: 
                 raise ServiceError("failed to find user_word_model")
 
             # get word model
-            word_model = self.words.find(word_id=user_word_model.word_id)
+            word_model = await self.words.find(word_id=user_word_model.word_id)
             if word_model is None: 
                 raise ServiceError("failed to find word_model")
            
@@ -83,78 +179,115 @@ class WordService:
         except Exception as e:
             raise ServiceError(f"service error: {e}")
 
+    # --- popular words ---
+    async def get_popular_words(self, limit: int) -> PopularWordsResponse: 
+        """ return the most registered word items from the materialized popular words collection """
+        try: 
+            records = await self.popular_words.find_top(limit)
+            return PopularWordsResponse(word_list=[
+                PopularWordsResponseBase(
+                    word_id=str(w.id), 
+                    spelling=w.spelling, 
+                    meaning=w.meaning, 
+                    registration_count=w.registration_count,
+                )
+                for w in records
+            ])
+        except mongo_errors.PyMongoError as e:
+            raise ServiceError(f"Database error: {e}")
+        except Exception as e:
+            raise ServiceError(f"service error: {e}")
+
     # --- suggest word ---
-    def generate_word_suggestion(self, payload: SuggestWordsRequest) -> SuggestWordsResponse: 
+    async def generate_word_suggestion(self, payload: SuggestWordsRequest) -> SuggestWordsResponse: 
         """
         get input_word and return suggest word items which are collected using the algorithm
         """
         try: 
-            # lcsの長さが大きいものから順番に取る（最大N個）
-            words = self.__collect_candidates_by_word_str(input_str=payload.input_str)
-
-            # (score, item)という形でsuggest itemsをlistにまとめる
-            scored: List[Tuple[float, WordModel]] = []  
-            lw = payload.input_str.lower()
-            for m in words:
-                w = m.details.spelling
-                score = self.__lcs_score(lw, w.lower())
-                scored.append((score, m))
-
-            # itemをregistered_countが大きいものの順に並べる
-            scored.sort(key=lambda t: (-t[0], -t[1].registration_count, len(t[1].details.spelling), t[1].details.spelling))
+            # 入力が空なら人気の単語（事前に集計したコレクション）を返す
+            if not payload.input_str.strip(): 
+                records = await self.popular_words.find_top(payload.max_num)
+                return SuggestWordsResponse(word_list=[
+                    SuggestWordsResponseBase(word_id=str(w.id), spelling=w.spelling, meaning=w.meaning) for w in records
+                ])
+
+            # 同じ入力（小文字化）に対する結果はindexが変わるまで再利用する
+            use_cache = suggest_index.loaded
+            if use_cache: 
+                cached = suggest_cache.get_result(payload.input_str, payload.max_num)
+                if cached is not None: 
+                    return cached
+
+            if suggest_index.loaded: 
+                # indexは部分列一致の候補をスコア順（短い単語から）に上位max_num個だけ返す
+                with SUGGEST_STAGE_DURATION.time("index"):
+                    top = suggest_index.top(payload.input_str, payload.max_num)
+            else: 
+                # lcsの長さが大きいものから順番に取る（最大N個）
+                with SUGGEST_STAGE_DURATION.time("collect"):
+                    subseq = self.__make_subsequence_regex(payload.input_str)
+                    words = await self.words.find_by_word_subseq(subseq, MAX_NUM_WORD_SUGGEST_CANDIDATE)
+
+                with SUGGEST_STAGE_DURATION.time("score"):
+                    # (score, item)という形でsuggest itemsをlistにまとめる
+                    scorer = LcsScorer(payload.input_str.lower())
+                    scores = scorer.score_all(m.spelling.lower() for m in words)
+                    scored: List[Tuple[float, WordRecord]] = list(zip(scores, words))
+
+                    # 上位max_num個だけをregistered_countが大きいものの順に取り出す（sort後のsliceと同じ結果）
+                    top = [word for _, word in heapq.nsmallest(payload.max_num, scored, key=suggestion_rank_key)]
 
             word_list: List[SuggestWordsResponseBase] = []
-            for m in scored[:MAX_NUM_WORD_SUGGEST]:
-                if not m[1].id: 
-                    raise ServiceError("failed to get id in WordModel item")
-
+            for word in top:
                 item = SuggestWordsResponseBase(
-                    word_id=str(m[1].id), 
-                    spelling=m[1].details.spelling, 
-                    meaning=m[1].details.meaning,
+                    word_id=str(word.id), 
+                    spelling=word.spelling, 
+                    meaning=word.meaning,
                 )
                 word_list.append(item)
 
-            return SuggestWordsResponse(word_list=word_list)
+            response = SuggestWordsResponse(word_list=word_list)
+            if use_cache: 
+                suggest_cache.put_result(payload.input_str, payload.max_num, response)
+            return response
         except mongo_errors.PyMongoError as e:
             raise ServiceError(f"Database error: {e}")
         except Exception as e:
             raise ServiceError(f"service error: {e}")
 
     # --- register word --- 
-    def register_word(self, payload: RegisterWordRequest, user_id: PyObjectId) -> None: 
+    async def register_word(self, payload: RegisterWordRequest, user_id: PyObjectId) -> None: 
         """
-        Entryが含まれていないならDBにNew Itemを加える
-        Itemのregistered_countをインクリメント
-        user_wordテーブルに加える
+        Entryが含まれていないならDBにNew Itemを加え、registered_countをインクリメント（upsert 1回）
+        user_wordテーブルに加える（重複はunique indexで検出）
+        transactionが使えない場合は重複時にregistered_countを戻す
         """
 
         try: 
             entry_word_details = WordDetails(spelling=payload.spelling, meaning=payload.meaning)
-            entry_model = self.words.find(word_details=entry_word_details)
-            if entry_model is None: 
-                new_word_model = WordModel(details=entry_word_details)
-                word_id = self.words.create(new_word_model)
-            else:
-                word_id = entry_model.id
-            if not word_id: 
-                raise ServiceError("Failed to get word_id")
-
-            # check if the user has alerady registered the word item
-            if self.user_words.find(user_id=user_id, word_id=word_id):
-                raise ConflictError("Word item is already registered by this user.")
 
-            # increment registered_count 
-            self.words.increment_registration_count(word_id)
-
-            # create link and return 
-            new_user_word_model = UserWordModel(
-                user_id=user_id, 
-                word_id=word_id, 
-                usage_example=UsageExample(sentence=payload.example_sentence, translation=payload.example_sentence_translation),
-            )
+            async def _register(session: AsyncClientSession | None) -> WordModel:
+                word_model = await self.words.upsert_and_increment_registration_count(entry_word_details, session=session)
+                if not word_model.id: 
+                    raise ServiceError("Failed to get word_id")
 
-            self.user_words.create(new_user_word_model)
+                # create link (fails if the user has alerady registered the word item)
+                new_user_word_model = UserWordModel(
+                    user_id=user_id, 
+                    word_id=word_model.id, 
+                    usage_example=UsageExample(sentence=payload.example_sentence, translation=payload.example_sentence_translation),
+                )
+                try: 
+                    await self.user_words.create(new_user_word_model, session=session)
+                except mongo_errors.DuplicateKeyError: 
+                    if session is None: 
+                        await self.words.decrement_registration_count(word_model.id)
+                    raise ConflictError("Word item is already registered by this user.")
+                await self.users.increment_word_list_version(user_id, session=session)
+                return word_model
+
+            word_model = await run_in_transaction(self.db, _register)
+            suggest_index.add(WordRecord.from_model(word_model))
             return            
 
         except mongo_errors.PyMongoError as e:
@@ -163,71 +296,218 @@ class WordService:
             raise ServiceError(f"service error: {e}")
 
     # --- delete a word item from user_word collection ---
-    def delete_word(self, payload: DeleteWordRequest) -> None: 
+    async def delete_word(self, payload: DeleteWordRequest) -> None: 
         """
         delete a word item from user_word collection if the item exists in it
+        and decrement registered_count of the word (must be greater than 0)
         """
-        
+
         try: 
-            # check if user_word link exists
-            user_word_model = self.user_words.find(user_word_id=PyObjectId(payload.user_word_id))
-            if not user_word_model: 
-                raise BadRequestError("Word item have not been registered by the current user")
+            user_word_id = PyObjectId(payload.user_word_id)
 
-            # declement register_word_count
-            word_model = self.words.find(word_id=user_word_model.word_id)
-            if word_model is None: 
-                raise ServiceError("Failed to find word model to delete")
+            async def _delete(session: AsyncClientSession | None) -> WordModel:
+                # delete the link
+                deleted_user_word_model = await self.user_words.delete(user_word_id=user_word_id, session=session)
+                if not deleted_user_word_model: 
+                    raise BadRequestError("Word item have not been registered by the current user")
 
-            if word_model.registration_count <= 0: 
-                raise ServiceError("Registered count must be greater than 0")
-            self.words.decrement_registration_count(PyObjectId(user_word_model.word_id))
+                # declement register_word_count
+                word_model = await self.words.decrement_registration_count(deleted_user_word_model.word_id, session=session)
+                if word_model is None: 
+                    if session is None: 
+                        await self.user_words.create(deleted_user_word_model)
+                    raise ServiceError("Registered count must be greater than 0")
+                await self.users.increment_word_list_version(deleted_user_word_model.user_id, session=session)
+                return word_model
+
+            word_model = await run_in_transaction(self.db, _delete)
+            suggest_index.add(WordRecord.from_model(word_model))
+            return         
+        except mongo_errors.PyMongoError as e:
+            raise ServiceError(f"Database error: {e}")
+        except Exception as e:
+            raise ServiceError(f"service error: {e}")
 
-            # delete the link
-            if not user_word_model.id: 
-                raise ServiceError("user_word id is empty")
-            deleted_user_word_model = self.user_words.delete(user_word_id=user_word_model.id)
+    # --- bulk register / delete ---
+    async def register_words(self, payload: BulkRegisterWordsRequest, user_id: PyObjectId) -> BulkWordOperationResponse: 
+        """ register many word items for the user with a handful of bulk round trips """
+        try: 
+            return await self.__register_items(list(payload.items), user_id)
+        except (BadRequestError, ConflictError): 
+            raise
+        except mongo_errors.PyMongoError as e:
+            raise ServiceError(f"Database error: {e}")
+        except Exception as e:
+            raise ServiceError(f"service error: {e}")
 
-            if not deleted_user_word_model:
-                raise ServiceError("Failed to delete user word item")
-            return         
+    async def register_words_csv(self, body: bytes, user_id: PyObjectId) -> BulkWordOperationResponse: 
+        """ 
+        same as register_words for a CSV of spelling, meaning, example_sentence, example_sentence_translation
+        (with or without header); rows failing validation are reported as invalid
+        """
+        try: 
+            text = body.decode("utf-8-sig")
+        except UnicodeDecodeError: 
+            raise BadRequestError("CSV must be UTF-8")
+
+        items: List[RegisterWordRequest | None] = []
+        for row in iter_csv_records(text.splitlines(), BULK_REGISTER_CSV_FIELDS): 
+            if len(items) >= const.MAX_NUM_BULK_WORD_OPERATION: 
+                raise BadRequestError(f"CSV must have at most {const.MAX_NUM_BULK_WORD_OPERATION} rows")
+            try: 
+                items.append(RegisterWordRequest.model_validate({k: v or None for k, v in row.items()}))
+            except ValidationError: 
+                items.append(None)
+        if not items: 
+            raise BadRequestError("CSV has no rows")
+
+        try: 
+            return await self.__register_items(items, user_id)
+        except (BadRequestError, ConflictError): 
+            raise
+        except mongo_errors.PyMongoError as e:
+            raise ServiceError(f"Database error: {e}")
+        except Exception as e:
+            raise ServiceError(f"service error: {e}")
+
+    async def delete_words(self, payload: BulkDeleteWordsRequest, user_id: PyObjectId) -> BulkWordOperationResponse: 
+        """
+        delete many of the user's word items and decrement registration_count with aggregated $inc
+        (find + delete_many, or mark + find + delete_many without a transaction, + bulk_write)
+        """
+        try: 
+            results: List[BulkWordOperationResponseBase | None] = [None] * len(payload.user_word_ids)
+            positions: Dict[PyObjectId, int] = {}
+            for i, s in enumerate(payload.user_word_ids): 
+                if not ObjectId.is_valid(s): 
+                    results[i] = BulkWordOperationResponseBase(index=i, status="invalid", user_word_id=s)
+                elif PyObjectId(s) in positions: 
+                    results[i] = BulkWordOperationResponseBase(index=i, status="duplicate", user_word_id=s)
+                else: 
+                    positions[PyObjectId(s)] = i
+
+            found = await self.user_words.find_many(user_id=user_id, user_word_ids=list(positions)) if positions else []
+
+            async def _delete(session: AsyncClientSession | None) -> Tuple[Set[PyObjectId], Dict[PyObjectId, int]]:
+                ids = [m.id for m in found if m.id]
+                if session is None: 
+                    # links deleted concurrently must not be decremented again
+                    deleted_ids = set(await self.user_words.delete_claimed(user_id=user_id, user_word_ids=ids))
+                else: 
+                    deleted = await self.user_words.delete_many(user_id=user_id, user_word_ids=ids, session=session)
+                    if deleted != len(ids): 
+                        raise ConflictError("Word items were deleted concurrently.")
+                    deleted_ids = set(ids)
+                deltas: Dict[PyObjectId, int] = defaultdict(int)
+                for m in found: 
+                    if m.id in deleted_ids: 
+                        deltas[m.word_id] -= 1
+                await self.words.bulk_increment_registration_counts(deltas, session=session)
+                if deleted_ids: 
+                    await self.users.increment_word_list_version(user_id, session=session)
+                return deleted_ids, deltas
+
+            deleted_ids: Set[PyObjectId] = set()
+            if found: 
+                deleted_ids, deltas = await run_in_transaction(self.db, _delete)
+                for word_id, delta in deltas.items(): 
+                    suggest_index.add_registration_count(word_id, delta)
+
+            for oid, i in positions.items(): 
+                status = "deleted" if oid in deleted_ids else "not_found"
+                results[i] = BulkWordOperationResponseBase(index=i, status=status, user_word_id=str(oid))
+            return BulkWordOperationResponse(results=[r for r in results if r is not None])
+
+        except (BadRequestError, ConflictError): 
+            raise
         except mongo_errors.PyMongoError as e:
             raise ServiceError(f"Database error: {e}")
         except Exception as e:
             raise ServiceError(f"service error: {e}")
 
     # --- private ---
-    def __lcs_len(self, a: str, b: str) -> int:
-        """Return LCS length using O(len(a)*len(b)) DP."""
-        n, m = len(a), len(b)
-        # Small optimization: keep a rolling 1D DP array
-        prev = [0] * (m + 1)
-        for i in range(1, n + 1):
-            cur = [0]
-            ai = a[i - 1]
-            for j in range(1, m + 1):
-                if ai == b[j - 1]:
-                    cur.append(prev[j - 1] + 1)
-                else:
-                    cur.append(max(prev[j], cur[-1]))
-            prev = cur
-        return prev[-1]
-
-    def __lcs_score(self, query: str, candidate: str) -> float:
-        """Normalize LCS length by max length to get [0,1]."""
-        if not query or not candidate:
-            return 0.0
-        return self.__lcs_len(query, candidate) / max(len(query), len(candidate))
+    async def __register_items(self, items: List[RegisterWordRequest | None], user_id: PyObjectId) -> BulkWordOperationResponse: 
+        """
+        1. upsert missing word items (bulk_write) and read them back
+        2. skip words the user has already registered
+        3. insert the new links (insert_many) and increment registration_count (bulk_write), in a transaction if available
+        None in items is reported as invalid.
+        """
+        results: List[BulkWordOperationResponseBase | None] = [None] * len(items)
+        positions: Dict[Tuple[str, str | None], Tuple[int, RegisterWordRequest]] = {}
+        for i, item in enumerate(items): 
+            if item is None: 
+                results[i] = BulkWordOperationResponseBase(index=i, status="invalid")
+            elif (item.spelling, item.meaning) in positions: 
+                results[i] = BulkWordOperationResponseBase(index=i, status="duplicate")
+            else: 
+                positions[(item.spelling, item.meaning)] = (i, item)
+
+        details = [WordDetails(spelling=spelling, meaning=meaning) for spelling, meaning in positions]
+        await self.words.bulk_upsert_details(details)
+        word_models = {
+            (m.details.spelling, m.details.meaning): m for m in await self.words.find_all_by_details(details)
+        }
+        registered = await self.user_words.find_registered_word_ids(
+            user_id=user_id, word_ids=[m.id for m in word_models.values() if m.id],
+        )
+
+        new_links: List[Tuple[int, WordModel, UserWordModel]] = []
+        for key, (i, item) in positions.items(): 
+            word_model = word_models.get(key)
+            if word_model is None or not word_model.id: 
+                raise ServiceError("Failed to get word_id")
+            if word_model.id in registered: 
+                results[i] = BulkWordOperationResponseBase(index=i, status="already_registered")
+                continue
+            new_links.append((i, word_model, UserWordModel(
+                id=PyObjectId(), 
+                user_id=user_id, 
+                word_id=word_model.id, 
+                usage_example=UsageExample(sentence=item.example_sentence, translation=item.example_sentence_translation),
+            )))
+
+        async def _link(session: AsyncClientSession | None) -> Set[int]:
+            duplicated = await self.user_words.create_many([link for _, _, link in new_links], session=session)
+            if duplicated and session is not None: 
+                raise ConflictError("Word items were registered concurrently.")
+            deltas: Dict[PyObjectId, int] = defaultdict(int)
+            for pos, (_, word_model, _) in enumerate(new_links): 
+                if pos not in duplicated and word_model.id: 
+                    deltas[word_model.id] += 1
+            await self.words.bulk_increment_registration_counts(deltas, session=session)
+            if len(duplicated) < len(new_links): 
+                await self.users.increment_word_list_version(user_id, session=session)
+            return duplicated
+
+        duplicated = await run_in_transaction(self.db, _link) if new_links else set()
+        for pos, (i, word_model, link) in enumerate(new_links): 
+            if pos in duplicated: 
+                results[i] = BulkWordOperationResponseBase(index=i, status="already_registered")
+                continue
+            results[i] = BulkWordOperationResponseBase(index=i, status="registered", user_word_id=str(link.id))
+            suggest_index.add(WordRecord.from_model(word_model)._replace(registration_count=word_model.registration_count + 1))
+
+        return BulkWordOperationResponse(results=[r for r in results if r is not None])
+
+    def __parse_cursor(self, after: str | None) -> PyObjectId | None: 
+        if after is None: 
+            return None
+        if not ObjectId.is_valid(after): 
+            raise BadRequestError("Invalid cursor")
+        return PyObjectId(after)
+
+    def __to_word_list_item(self, doc: dict) -> GetWordListResponseBase: 
+        if doc.get("spelling") is None: 
+            raise ServiceError("failed to find word model")
+        return GetWordListResponseBase(
+            user_word_id=doc["user_word_id"],
+            spelling=doc["spelling"], 
+            meaning=doc.get("meaning"), 
+        )
 
     def __make_subsequence_regex(self, q: str) -> str:
         """Build a regex like 'a.*b.*c' to quickly prefilter subsequence-like matches."""
         parts = [re.escape(ch) for ch in q]
         return ".*".join(parts)
 
-    def __collect_candidates_by_word_str(self, input_str: str, limit: int = MAX_NUM_WORD_SUGGEST_CANDIDATE) -> List[WordModel]:
-        """
-        Build a subsequence regex from input_word and fetch candidate words from DB.
-        """
-        subseq = self.__make_subsequence_regex(input_str)
-        return self.words.find_by_word_subseq(subseq, limit)
-